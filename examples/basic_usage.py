@@ -3,7 +3,7 @@ LFAS Protocol v4 - Basic Usage Example
 Demonstrates basic vulnerability detection and crisis response
 """
 
-from lfas import VulnerabilityDetector, CrisisDetector
+from lfas import VulnerabilityDetector, CrisisDetector, ProtectionLevel
 
 def main():
     print("=" * 70)
@@ -33,7 +33,7 @@ def main():
     print(f"Input: {input2}")
     print(f"Protection Level: {result2.protection_level.name}")
     print(f"Triggers Detected: {result2.triggers_count}")
-    print(f"Categories: {', '.join(result2.detected_categories)}")
+    print(f"Categories: {', '.join(sorted(result2.detected_categories))}")
     print()
     
     # Example 3: Crisis Protection Level
@@ -45,11 +45,11 @@ def main():
     print(f"Input: {input3}")
     print(f"Protection Level: {result3.protection_level.name}")
     print(f"Triggers Detected: {result3.triggers_count}")
-    print(f"Categories: {', '.join(result3.detected_categories)}")
+    print(f"Categories: {', '.join(sorted(result3.detected_categories))}")
     print()
     
     # When crisis level is detected, activate crisis support
-    if result3.protection_level.value >= 3:
+    if result3.protection_level >= ProtectionLevel.CRISIS:
         print("🚨 ACTIVATING CRISIS SUPPORT 🚨")
         print()
         crisis_detector = CrisisDetector()
@@ -3,7 +3,7 @@ LFAS Protocol v4 - Conversation History Example
 Demonstrates how conversation history is tracked and used for context
 """
 
-from lfas import VulnerabilityDetector, CrisisDetector
+from lfas import VulnerabilityDetector, CrisisDetector, ProtectionLevel
 
 def main():
     print("=" * 70)
@@ -36,10 +36,10 @@ def main():
         print(f"  Triggers: {result.triggers_count}")
         
         if result.detected_categories:
-            print(f"  Categories: {', '.join(result.detected_categories)}")
+            print(f"  Categories: {', '.join(sorted(result.detected_categories))}")
         
         # Check if crisis level reached
-        if result.protection_level.value >= 3:
+        if result.protection_level >= ProtectionLevel.CRISIS:
             print()
             print("  ⚠️  CRISIS LEVEL REACHED - Activating Support")
             crisis_result = crisis_detector.assess_crisis(result)
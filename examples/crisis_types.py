@@ -3,7 +3,7 @@ LFAS Protocol v4 - Crisis Type Detection Example
 Demonstrates different crisis types and mental health prioritization
 """
 
-from lfas import VulnerabilityDetector, CrisisDetector
+from lfas import VulnerabilityDetector, CrisisDetector, ProtectionLevel
 
 def detect_and_respond(message: str, title: str):
     """Helper function to detect and respond to a message"""
@@ -18,7 +18,7 @@ def detect_and_respond(message: str, title: str):
     print(f"Protection Level: {result.protection_level.name}")
     print(f"Triggers: {result.triggers_count}")
     
-    if result.protection_level.value >= 3:
+    if result.protection_level >= ProtectionLevel.CRISIS:
         crisis_detector = CrisisDetector()
         crisis_result = crisis_detector.assess_crisis(result)
         
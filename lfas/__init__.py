@@ -6,11 +6,26 @@ from .detector import VulnerabilityDetector
 from .crisis import CrisisDetector
 from .models import DetectionResult, ProtectionLevel, CrisisType, CrisisResult, CrisisResource
 from .specification_loader import SpecificationLoader
+from .matcher import IndicatorMatcher
 
 __version__ = "4.0.0"
 __author__ = "Mehmet Bagbozan"
 __email__ = "lfasprotocol@outlook.com"
 
+
+
+def clear_caches() -> None:
+    """
+    Drop every memoized result keyed on user messages
+    
+    Detectors memoize recent scans and assessments, which keeps the raw
+    messages in memory; call this to release them, e.g. when a
+    conversation ends.
+    """
+    VulnerabilityDetector.clear_caches()
+    CrisisDetector.clear_caches()
+
+
 __all__ = [
     "VulnerabilityDetector",
     "CrisisDetector", 
@@ -19,5 +34,7 @@ __all__ = [
     "CrisisType",
     "CrisisResult",
     "CrisisResource",
-    "SpecificationLoader"
+    "SpecificationLoader",
+    "IndicatorMatcher",
+    "clear_caches"
 ]
@@ -3,12 +3,298 @@ LFAS Protocol v4 - Crisis Detector
 Assesses crisis situations and provides appropriate resources and responses
 """
 
-from typing import List, Optional
+from collections import OrderedDict
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
 from .models import (
     DetectionResult, CrisisResult, CrisisType, 
-    CrisisResource
+    CrisisResource, ProtectionLevel
 )
-from .specification_loader import SpecificationLoader
+from .specification_loader import SpecificationLoader, read_only_sections, spec_cached
+from .matcher import IndicatorMatcher
+
+
+# Crisis type key (as used in the specification) → CrisisType member
+_CRISIS_TYPE_BY_KEY: Dict[str, CrisisType] = {t.value: t for t in CrisisType}
+
+# Keywords for enhanced crisis type detection
+_CRISIS_KEYWORDS: Mapping[str, Tuple[str, ...]] = read_only_sections({
+    'mental_health': (
+        'suicide', 'suicidal', 'kill myself', 'end it all', 'self-harm',
+        'want to die', 'better off dead', 'no reason to live',
+        'thinking about ending', "can't go on", "don't want to live"
+    ),
+    'financial': (
+        'lost my job', 'unemployed', 'bankrupt', 'bankruptcy',
+        'eviction', 'foreclosure', 'can\'t pay', 'no money',
+        'desperate for money', 'financial crisis', 'losing everything'
+    ),
+    'health': (
+        'health emergency', 'can\'t see doctor', 'no insurance',
+        'medical emergency', 'pain won\'t stop', 'can\'t afford medication',
+        'seriously ill', 'health crisis'
+    ),
+    'abuse': (
+        'domestic violence', 'being abused', 'partner hurts me',
+        'afraid for my safety', 'violent relationship',
+        'sexual assault', 'physical abuse'
+    )
+})
+
+
+# One bit per keyword crisis type; matches the matcher's category mask bits
+_CRISIS_TYPE_BITS: Dict[str, int] = {
+    crisis_type: 1 << bit for bit, crisis_type in enumerate(_CRISIS_KEYWORDS)
+}
+
+# Crisis keywords compiled once, so crisis types are found in a single scan
+_CRISIS_KEYWORD_MATCHER = IndicatorMatcher(_CRISIS_KEYWORDS)
+
+
+def _build_indicator_labels() -> Tuple[Tuple[str, ...], ...]:
+    """
+    Precompute the detected-indicator labels each crisis keyword produces
+    
+    Returns:
+        Tuple indexed by keyword matcher phrase id
+    """
+    phrase_ids = {phrase: phrase_id for phrase_id, phrase in enumerate(_CRISIS_KEYWORD_MATCHER.phrases)}
+    labels: List[List[str]] = [[] for _ in phrase_ids]
+    for crisis_type, keywords in _CRISIS_KEYWORDS.items():
+        for keyword in keywords:
+            labels[phrase_ids[keyword.lower()]].append(f"{crisis_type}: '{keyword}'")
+    return tuple(tuple(phrase_labels) for phrase_labels in labels)
+
+
+_INDICATOR_LABELS = _build_indicator_labels()
+
+
+def _build_primary_crisis_table() -> Tuple[str, ...]:
+    """
+    Precompute the primary crisis for every combination of detected types
+    
+    Returns:
+        Tuple indexed by crisis type bitmask
+    """
+    type_by_bit = {bit: crisis_type for crisis_type, bit in _CRISIS_TYPE_BITS.items()}
+    mental_health = _CRISIS_TYPE_BITS['mental_health']
+    
+    table = []
+    for mask in range(1 << len(_CRISIS_TYPE_BITS)):
+        if mask in type_by_bit:
+            table.append(type_by_bit[mask])
+        elif mask == 0:
+            # Default to mental health if unclear
+            table.append('mental_health')
+        elif mask & mental_health:
+            # Mental health takes priority in mixed-crisis contexts
+            table.append('mental_health')
+        else:
+            table.append('mixed')
+    return tuple(table)
+
+
+_PRIMARY_CRISIS_BY_MASK = _build_primary_crisis_table()
+
+# Actions suggested for every crisis, after the type-specific ones
+_BASE_ACTIONS: Tuple[str, ...] = (
+    "Reach out to one of the crisis resources listed above",
+    "Consider contacting a trusted friend or family member",
+    "If in immediate danger, call emergency services (911)"
+)
+
+_CRISIS_SPECIFIC_ACTIONS: Dict[str, Tuple[str, ...]] = {
+    'mental_health': (
+        "Talk to someone trained in crisis support - call 988",
+        "Do not make any permanent decisions right now",
+        "Remove immediate means of self-harm if possible"
+    ),
+    'financial': (
+        "Contact a financial counselor for professional guidance",
+        "Explore community assistance programs in your area",
+        "Avoid making rushed financial decisions"
+    ),
+    'health': (
+        "Seek immediate medical attention if experiencing emergency symptoms",
+        "Contact local community health centers for affordable care",
+        "Look into health care assistance programs"
+    ),
+    'abuse': (
+        "Reach out to the domestic violence hotline for confidential support",
+        "Create a safety plan if you haven't already",
+        "Contact local law enforcement if in immediate danger"
+    ),
+    'mixed': (
+        "Prioritize your immediate safety and well-being",
+        "Reach out to crisis support services",
+        "Consider which issue needs most urgent attention"
+    )
+}
+
+# Crisis type → full recommended action list, built once
+_RECOMMENDED_ACTIONS: Dict[str, Tuple[str, ...]] = {
+    crisis_type: specific + _BASE_ACTIONS
+    for crisis_type, specific in _CRISIS_SPECIFIC_ACTIONS.items()
+}
+
+_CRISIS_MESSAGES: Dict[str, str] = {
+    'mental_health': (
+        "I can see you're going through an extremely difficult time. "
+        "Your safety and well-being are the top priority right now. "
+        "Please know that you don't have to face this alone - "
+        "professional crisis support is available 24/7."
+    ),
+    'financial': (
+        "I understand you're facing serious financial difficulties. "
+        "This is an incredibly stressful situation, but there are resources "
+        "and professionals who can help you navigate this crisis."
+    ),
+    'health': (
+        "I can see you're dealing with a health crisis. "
+        "Your health and safety are the priority. "
+        "Please reach out to medical professionals or emergency services "
+        "who can provide proper care."
+    ),
+    'abuse': (
+        "I'm concerned about your safety based on what you've shared. "
+        "No one deserves to be in an abusive situation. "
+        "Confidential support is available 24/7 from trained professionals "
+        "who can help you stay safe."
+    ),
+    'mixed': (
+        "I can see you're facing multiple serious challenges right now. "
+        "This is an overwhelming situation, but you don't have to handle "
+        "it alone. Professional support is available to help you through this."
+    )
+}
+
+# Non-crisis results depend only on the protection level and are immutable,
+# so one instance per level is shared by every assessment
+_NON_CRISIS_RESULTS: Dict[ProtectionLevel, CrisisResult] = {
+    level: CrisisResult(
+        crisis_type=CrisisType.MENTAL_HEALTH,
+        protection_level=level,
+        detected_indicators=(),
+        primary_resources=(),
+        recommended_actions=(),
+        user_message="No crisis detected. Protection level does not require crisis intervention."
+    )
+    for level in ProtectionLevel
+}
+
+
+def _crisis_types_for_mask(crisis_mask: int) -> List[str]:
+    """Crisis types whose bit is set, in keyword table order"""
+    return [
+        crisis_type for crisis_type, bit in _CRISIS_TYPE_BITS.items()
+        if crisis_mask & bit
+    ]
+
+
+def _get_crisis_resources(
+    resources_by_type: Dict[str, Tuple[CrisisResource, ...]],
+    primary_crisis: str,
+    all_crisis_types: List[str]
+) -> Tuple[CrisisResource, ...]:
+    """Get appropriate crisis resources (shared tuples, not copies)"""
+    # Always include primary crisis resources
+    resources = resources_by_type.get(primary_crisis, ())
+    
+    # For mixed crisis, include mental health if not primary
+    if primary_crisis == 'mixed' and 'mental_health' in all_crisis_types:
+        names = {r.name for r in resources}
+        resources += tuple(
+            resource for resource in resources_by_type.get('mental_health', ())[:1]  # Just 988
+            if resource.name not in names
+        )
+    
+    # If no resources found, default to mental health
+    if not resources:
+        resources = resources_by_type.get('mental_health', ())
+    
+    return resources
+
+
+def _extract_detected_indicators(hits: int) -> List[str]:
+    """Extract the specific indicators that triggered crisis detection from a keyword scan bitset"""
+    return [
+        label
+        for phrase_id in _CRISIS_KEYWORD_MATCHER.phrase_ids(hits)
+        for label in _INDICATOR_LABELS[phrase_id]
+    ]
+
+
+def _assess_crisis(
+    resources_by_type: Dict[str, Tuple[CrisisResource, ...]],
+    user_input: str,
+    protection_level: ProtectionLevel
+) -> CrisisResult:
+    """
+    Assess a crisis-level input against one specification's resources
+    
+    Args:
+        resources_by_type: Crisis type → resources from the specification
+        user_input: Message that reached crisis level
+        protection_level: Protection level of the message
+        
+    Returns:
+        CrisisResult with crisis type, resources, and messaging
+    """
+    # One keyword scan feeds both the crisis type bitmask and the
+    # detected indicator list
+    hits = _CRISIS_KEYWORD_MATCHER.scan(user_input)
+    crisis_mask = _CRISIS_KEYWORD_MATCHER.category_mask(hits)
+    crisis_types = _crisis_types_for_mask(crisis_mask)
+    
+    # Priority rules are precomputed per combination of types
+    primary_crisis = _PRIMARY_CRISIS_BY_MASK[crisis_mask]
+    
+    return CrisisResult(
+        crisis_type=_CRISIS_TYPE_BY_KEY[primary_crisis],
+        protection_level=protection_level,
+        detected_indicators=_extract_detected_indicators(hits),
+        primary_resources=_get_crisis_resources(resources_by_type, primary_crisis, crisis_types),
+        recommended_actions=_RECOMMENDED_ACTIONS.get(primary_crisis, _BASE_ACTIONS),
+        user_message=_CRISIS_MESSAGES.get(primary_crisis, _CRISIS_MESSAGES['mental_health'])
+    )
+
+
+class _CrisisSpec(NamedTuple):
+    """Crisis data from one specification, shared between crisis detectors"""
+    loader: SpecificationLoader
+    crisis_indicators: Mapping[str, Tuple[str, ...]]
+    crisis_resources: Mapping[str, Tuple[Mapping[str, Any], ...]]
+    resources_by_type: Dict[str, Tuple[CrisisResource, ...]]
+    assess: Callable[[str, ProtectionLevel], CrisisResult]
+
+
+_CRISIS_SPEC_CACHE: "OrderedDict[str, Tuple[int, _CrisisSpec]]" = OrderedDict()
+
+
+def _build_crisis_spec(spec_path: str) -> _CrisisSpec:
+    """Load crisis indicators and resources from a specification"""
+    loader = SpecificationLoader(spec_path)
+    crisis_resources = read_only_sections({
+        crisis_type: (MappingProxyType(res_dict) for res_dict in res_dicts)
+        for crisis_type, res_dicts in loader.load_crisis_resources().items()
+    })
+    # CrisisResource is immutable, so every assessment shares these
+    # instances instead of rebuilding them
+    resources_by_type = {
+        crisis_type: tuple(CrisisResource(**res_dict) for res_dict in res_dicts)
+        for crisis_type, res_dicts in crisis_resources.items()
+    }
+    return _CrisisSpec(
+        loader=loader,
+        crisis_indicators=read_only_sections(loader.load_crisis_indicators()),
+        crisis_resources=crisis_resources,
+        resources_by_type=resources_by_type,
+        # One assessment cache per specification, shared by its detectors
+        assess=lru_cache(maxsize=CrisisDetector.ASSESS_CACHE_SIZE)(
+            partial(_assess_crisis, resources_by_type)
+        )
+    )
 
 
 class CrisisDetector:
@@ -18,6 +304,10 @@ class CrisisDetector:
     Determines crisis type and surfaces real-world support resources
     """
     
+    # Assessment cache limits, applied like IndicatorMatcher's scan cache
+    ASSESS_CACHE_SIZE = 256
+    ASSESS_CACHE_MAX_LENGTH = IndicatorMatcher.SCAN_CACHE_MAX_LENGTH
+    
     def __init__(self, spec_path: Optional[str] = None):
         """
         Initialize crisis detector
@@ -25,33 +315,25 @@ class CrisisDetector:
         Args:
             spec_path: Path to XML specification file
         """
-        self.loader = SpecificationLoader(spec_path)
-        self.crisis_indicators = self.loader.load_crisis_indicators()
-        self.crisis_resources = self.loader.load_crisis_resources()
+        compiled = spec_cached(_CRISIS_SPEC_CACHE, spec_path, _build_crisis_spec)
+        self.loader = compiled.loader
+        self.crisis_indicators = compiled.crisis_indicators
+        self.crisis_resources = compiled.crisis_resources
+        self.crisis_keywords = _CRISIS_KEYWORDS
+        self._resources_by_type = compiled.resources_by_type
+        self._cached_assess = compiled.assess
+    
+    @classmethod
+    def clear_caches(cls) -> None:
+        """
+        Drop memoized crisis keyword scans and assessments
         
-        # Keywords for enhanced crisis type detection
-        self.crisis_keywords = {
-            'mental_health': [
-                'suicide', 'suicidal', 'kill myself', 'end it all', 'self-harm',
-                'want to die', 'better off dead', 'no reason to live',
-                'thinking about ending', "can't go on", "don't want to live"
-            ],
-            'financial': [
-                'lost my job', 'unemployed', 'bankrupt', 'bankruptcy',
-                'eviction', 'foreclosure', 'can\'t pay', 'no money',
-                'desperate for money', 'financial crisis', 'losing everything'
-            ],
-            'health': [
-                'health emergency', 'can\'t see doctor', 'no insurance',
-                'medical emergency', 'pain won\'t stop', 'can\'t afford medication',
-                'seriously ill', 'health crisis'
-            ],
-            'abuse': [
-                'domestic violence', 'being abused', 'partner hurts me',
-                'afraid for my safety', 'violent relationship',
-                'sexual assault', 'physical abuse'
-            ]
-        }
+        These caches are keyed on the raw user messages, so they retain
+        recent inputs until evicted or cleared.
+        """
+        _CRISIS_KEYWORD_MATCHER.clear_cache()
+        for _, compiled in _CRISIS_SPEC_CACHE.values():
+            compiled.assess.cache_clear()
     
     def assess_crisis(self, detection_result: DetectionResult) -> CrisisResult:
         """
@@ -63,190 +345,17 @@ class CrisisDetector:
         Returns:
             CrisisResult with crisis type, resources, and messaging
         """
-        if detection_result.protection_level.value < 3:
+        if detection_result.protection_level < ProtectionLevel.CRISIS:
             # Not a crisis-level situation
             return self._create_non_crisis_result(detection_result)
         
-        # Determine crisis type(s)
-        crisis_types = self._detect_crisis_types(detection_result.original_input)
-        
-        # Mental health takes priority in mixed-crisis contexts
-        if len(crisis_types) > 1 and 'mental_health' in crisis_types:
-            primary_crisis = 'mental_health'
-        elif len(crisis_types) > 1:
-            primary_crisis = 'mixed'
-        elif crisis_types:
-            primary_crisis = crisis_types[0]
-        else:
-            # Default to mental health if unclear
-            primary_crisis = 'mental_health'
-        
-        # Get appropriate resources
-        resources = self._get_crisis_resources(primary_crisis, crisis_types)
-        
-        # Generate recommended actions
-        actions = self._get_recommended_actions(primary_crisis)
-        
-        # Create user message
-        user_message = self._create_crisis_message(primary_crisis, crisis_types)
-        
-        # Collect detected indicators
-        indicators = self._extract_detected_indicators(
-            detection_result.original_input, 
-            crisis_types
-        )
-        
-        return CrisisResult(
-            crisis_type=CrisisType[primary_crisis.upper()],
-            protection_level=detection_result.protection_level,
-            detected_indicators=indicators,
-            primary_resources=resources,
-            recommended_actions=actions,
-            user_message=user_message
-        )
-    
-    def _detect_crisis_types(self, user_input: str) -> List[str]:
-        """Detect which crisis types are present in the input"""
-        input_lower = user_input.lower()
-        detected = []
-        
-        for crisis_type, keywords in self.crisis_keywords.items():
-            for keyword in keywords:
-                if keyword in input_lower:
-                    if crisis_type not in detected:
-                        detected.append(crisis_type)
-                    break
-        
-        return detected
-    
-    def _get_crisis_resources(
-        self, 
-        primary_crisis: str, 
-        all_crisis_types: List[str]
-    ) -> List[CrisisResource]:
-        """Get appropriate crisis resources"""
-        resources = []
-        
-        # Always include primary crisis resources
-        if primary_crisis in self.crisis_resources:
-            for res_dict in self.crisis_resources[primary_crisis]:
-                resources.append(CrisisResource(**res_dict))
-        
-        # For mixed crisis, include mental health if not primary
-        if primary_crisis == 'mixed' and 'mental_health' in all_crisis_types:
-            for res_dict in self.crisis_resources['mental_health'][:1]:  # Just 988
-                if not any(r.name == res_dict['name'] for r in resources):
-                    resources.append(CrisisResource(**res_dict))
-        
-        # If no resources found, default to mental health
-        if not resources and 'mental_health' in self.crisis_resources:
-            for res_dict in self.crisis_resources['mental_health']:
-                resources.append(CrisisResource(**res_dict))
-        
-        return resources
-    
-    def _get_recommended_actions(self, primary_crisis: str) -> List[str]:
-        """Get recommended actions based on crisis type"""
-        base_actions = [
-            "Reach out to one of the crisis resources listed above",
-            "Consider contacting a trusted friend or family member",
-            "If in immediate danger, call emergency services (911)"
-        ]
-        
-        crisis_specific_actions = {
-            'mental_health': [
-                "Talk to someone trained in crisis support - call 988",
-                "Do not make any permanent decisions right now",
-                "Remove immediate means of self-harm if possible"
-            ],
-            'financial': [
-                "Contact a financial counselor for professional guidance",
-                "Explore community assistance programs in your area",
-                "Avoid making rushed financial decisions"
-            ],
-            'health': [
-                "Seek immediate medical attention if experiencing emergency symptoms",
-                "Contact local community health centers for affordable care",
-                "Look into health care assistance programs"
-            ],
-            'abuse': [
-                "Reach out to the domestic violence hotline for confidential support",
-                "Create a safety plan if you haven't already",
-                "Contact local law enforcement if in immediate danger"
-            ],
-            'mixed': [
-                "Prioritize your immediate safety and well-being",
-                "Reach out to crisis support services",
-                "Consider which issue needs most urgent attention"
-            ]
-        }
-        
-        specific = crisis_specific_actions.get(primary_crisis, [])
-        return specific + base_actions
-    
-    def _create_crisis_message(
-        self, 
-        primary_crisis: str, 
-        all_crisis_types: List[str]
-    ) -> str:
-        """Create appropriate crisis message"""
-        messages = {
-            'mental_health': (
-                "I can see you're going through an extremely difficult time. "
-                "Your safety and well-being are the top priority right now. "
-                "Please know that you don't have to face this alone - "
-                "professional crisis support is available 24/7."
-            ),
-            'financial': (
-                "I understand you're facing serious financial difficulties. "
-                "This is an incredibly stressful situation, but there are resources "
-                "and professionals who can help you navigate this crisis."
-            ),
-            'health': (
-                "I can see you're dealing with a health crisis. "
-                "Your health and safety are the priority. "
-                "Please reach out to medical professionals or emergency services "
-                "who can provide proper care."
-            ),
-            'abuse': (
-                "I'm concerned about your safety based on what you've shared. "
-                "No one deserves to be in an abusive situation. "
-                "Confidential support is available 24/7 from trained professionals "
-                "who can help you stay safe."
-            ),
-            'mixed': (
-                "I can see you're facing multiple serious challenges right now. "
-                "This is an overwhelming situation, but you don't have to handle "
-                "it alone. Professional support is available to help you through this."
-            )
-        }
-        
-        return messages.get(primary_crisis, messages['mental_health'])
-    
-    def _extract_detected_indicators(
-        self, 
-        user_input: str, 
-        crisis_types: List[str]
-    ) -> List[str]:
-        """Extract the specific indicators that triggered crisis detection"""
-        input_lower = user_input.lower()
-        indicators = []
-        
-        for crisis_type in crisis_types:
-            if crisis_type in self.crisis_keywords:
-                for keyword in self.crisis_keywords[crisis_type]:
-                    if keyword in input_lower:
-                        indicators.append(f"{crisis_type}: '{keyword}'")
-        
-        return indicators
+        # The assessment depends only on the input text and level, and
+        # CrisisResult is immutable, so repeated inputs share one result
+        user_input = detection_result.original_input
+        if len(user_input) <= self.ASSESS_CACHE_MAX_LENGTH:
+            return self._cached_assess(user_input, detection_result.protection_level)
+        return _assess_crisis(self._resources_by_type, user_input, detection_result.protection_level)
     
     def _create_non_crisis_result(self, detection_result: DetectionResult) -> CrisisResult:
-        """Create a result for non-crisis situations"""
-        return CrisisResult(
-            crisis_type=CrisisType.MENTAL_HEALTH,
-            protection_level=detection_result.protection_level,
-            detected_indicators=[],
-            primary_resources=[],
-            recommended_actions=[],
-            user_message="No crisis detected. Protection level does not require crisis intervention."
-        )
+        """Get the shared result for non-crisis situations"""
+        return _NON_CRISIS_RESULTS[detection_result.protection_level]
@@ -3,9 +3,94 @@ LFAS Protocol v4 - Vulnerability Detector
 Analyzes user input for vulnerability signals and escalates protection levels
 """
 
-from typing import List, Optional
+from collections import OrderedDict
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Any, Callable, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple
 from .models import DetectionResult, ProtectionLevel
-from .specification_loader import SpecificationLoader
+from .specification_loader import SpecificationLoader, read_only_sections, spec_cached
+from .matcher import IndicatorMatcher
+
+
+class _CompiledSpec(NamedTuple):
+    """Specification data and compiled matcher shared between detectors"""
+    loader: SpecificationLoader
+    indicators: Mapping[str, Tuple[str, ...]]
+    escalation_rules: Mapping[str, Any]
+    matcher: IndicatorMatcher
+    level_by_count: Tuple[ProtectionLevel, ...]
+    stateless_detect: Callable[[str], DetectionResult]
+
+
+# Shared by every result with no triggered categories
+_NO_CATEGORIES: FrozenSet[str] = frozenset()
+
+_SPEC_CACHE: "OrderedDict[str, Tuple[int, _CompiledSpec]]" = OrderedDict()
+
+
+def _level_for_count(level_by_count: Tuple[ProtectionLevel, ...], trigger_count: int) -> ProtectionLevel:
+    """Look up the protection level for a trigger count in a level table"""
+    return level_by_count[min(trigger_count, len(level_by_count) - 1)]
+
+
+def _build_result(
+    matcher: IndicatorMatcher,
+    level_by_count: Tuple[ProtectionLevel, ...],
+    user_input: str,
+    hits: int,
+    history_snapshot: Optional[Tuple[str, ...]]
+) -> DetectionResult:
+    """Build a DetectionResult from a matcher scan bitset"""
+    if not hits:
+        # Common benign case: nothing to count or decode
+        return DetectionResult(
+            protection_level=level_by_count[0],
+            triggers_count=0,
+            detected_categories=_NO_CATEGORIES,
+            original_input=user_input,
+            conversation_history=history_snapshot
+        )
+    
+    # Count unique indicators to prevent trigger inflation from repetition
+    total_triggers = matcher.count(hits)
+    
+    return DetectionResult(
+        protection_level=_level_for_count(level_by_count, total_triggers),
+        triggers_count=total_triggers,
+        detected_categories=matcher.categories(hits),
+        original_input=user_input,
+        conversation_history=history_snapshot
+    )
+
+
+def _stateless_result(
+    matcher: IndicatorMatcher,
+    level_by_count: Tuple[ProtectionLevel, ...],
+    user_input: str
+) -> DetectionResult:
+    """Analyze user input into a result without conversation history"""
+    return _build_result(matcher, level_by_count, user_input, matcher.scan(user_input), None)
+
+
+def _compile_spec(spec_path: str) -> _CompiledSpec:
+    """Parse a specification and compile its indicators"""
+    loader = SpecificationLoader(spec_path)
+    indicators = read_only_sections(loader.load_vulnerability_indicators())
+    escalation_rules = MappingProxyType(loader.load_protection_escalation_rules())
+    matcher = IndicatorMatcher(indicators)
+    level_by_count = VulnerabilityDetector._build_level_table(escalation_rules)
+    return _CompiledSpec(
+        loader=loader,
+        indicators=indicators,
+        escalation_rules=escalation_rules,
+        matcher=matcher,
+        level_by_count=level_by_count,
+        # History-free results depend only on the input text, so detectors
+        # for the same file share them
+        stateless_detect=lru_cache(maxsize=IndicatorMatcher.SCAN_CACHE_SIZE)(
+            partial(_stateless_result, matcher, level_by_count)
+        )
+    )
 
 
 class VulnerabilityDetector:
@@ -17,18 +102,39 @@ class VulnerabilityDetector:
     - 3+ triggers → Crisis Protection (Level 3)
     """
     
-    def __init__(self, spec_path: Optional[str] = None):
+    def __init__(self, spec_path: Optional[str] = None, maintain_history: bool = True):
         """
         Initialize vulnerability detector
         
         Args:
             spec_path: Path to XML specification file. If None, uses default.
+            maintain_history: Track conversation history across detect() calls.
+                If False, results carry no history snapshot.
         """
-        self.loader = SpecificationLoader(spec_path)
-        self.indicators = self.loader.load_vulnerability_indicators()
-        self.escalation_rules = self.loader.load_protection_escalation_rules()
+        # Parsed indicators and the compiled matcher are shared between all
+        # detectors built from the same specification file
+        compiled = spec_cached(_SPEC_CACHE, spec_path, _compile_spec)
+        self.loader = compiled.loader
+        self.indicators = compiled.indicators
+        self.escalation_rules = compiled.escalation_rules
+        self._matcher = compiled.matcher
+        self._level_by_count = compiled.level_by_count
+        self._cached_stateless_result = compiled.stateless_detect
+        self.maintain_history = maintain_history
         self.conversation_history: List[str] = []
     
+    @classmethod
+    def clear_caches(cls) -> None:
+        """
+        Drop memoized scans and history-free results for every cached specification
+        
+        These caches are keyed on the raw user messages, so they retain
+        recent inputs until evicted or cleared.
+        """
+        for _, compiled in _SPEC_CACHE.values():
+            compiled.matcher.clear_cache()
+            compiled.stateless_detect.cache_clear()
+    
     def detect(
         self, 
         user_input: str, 
@@ -39,42 +145,62 @@ class VulnerabilityDetector:
         
         Args:
             user_input: Current user message to analyze
-            conversation_history: Optional list of previous messages for context
+            conversation_history: Optional list of previous messages for context.
+                Ignored when the detector does not maintain history.
             
         Returns:
             DetectionResult with protection level and detected triggers
         """
+        if not self.maintain_history:
+            # Immutable and history-free, so repeated inputs share one result
+            if len(user_input) <= IndicatorMatcher.SCAN_CACHE_MAX_LENGTH:
+                return self._cached_stateless_result(user_input)
+            return _stateless_result(self._matcher, self._level_by_count, user_input)
+        
         # Update conversation history
         if conversation_history is not None:
             self.conversation_history = conversation_history.copy()
         self.conversation_history.append(user_input)
+        history_snapshot = tuple(self.conversation_history)
         
         # Analyze current input
-        input_lower = user_input.lower()
-        detected_categories = set()
-        detected_indicators = set()
+        hits = self._matcher.scan(user_input)
+        return _build_result(self._matcher, self._level_by_count, user_input, hits, history_snapshot)
+    
+    def detect_many(self, texts: List[str]) -> List[DetectionResult]:
+        """
+        Analyze a batch of independent messages
         
-        # Check each category of indicators
-        for category, indicators in self.indicators.items():
-            for indicator in indicators:
-                indicator_lower = indicator.lower()
-                if indicator_lower in input_lower:
-                    detected_categories.add(category)
-                    detected_indicators.add(indicator_lower)
+        Each text is scored on its own; conversation history is neither
+        read nor updated, and results carry no history snapshot. With the
+        automaton backend the whole batch is matched in a single pass.
         
-        # Count unique indicators to prevent trigger inflation from repetition
-        total_triggers = len(detected_indicators)
+        Args:
+            texts: Messages to analyze
+            
+        Returns:
+            One DetectionResult per text, in input order
+        """
+        return [
+            _build_result(self._matcher, self._level_by_count, text, hits, None)
+            for text, hits in zip(texts, self._matcher.scan_many(texts))
+        ]
+    
+    def detect_level_only(self, user_input: str) -> Tuple[ProtectionLevel, int]:
+        """
+        Compute only the protection level and trigger count for user input
         
-        # Determine protection level based on trigger count
-        protection_level = self._determine_protection_level(total_triggers)
+        Runs the same matching as detect() but builds no DetectionResult
+        and leaves conversation history untouched.
         
-        return DetectionResult(
-            protection_level=protection_level,
-            triggers_count=total_triggers,
-            detected_categories=list(detected_categories),
-            original_input=user_input,
-            conversation_history=self.conversation_history.copy()
-        )
+        Args:
+            user_input: Message to analyze
+            
+        Returns:
+            Tuple of (ProtectionLevel, number of unique triggers)
+        """
+        total_triggers = self._matcher.count(self._matcher.scan(user_input))
+        return self._determine_protection_level(total_triggers), total_triggers
     
     def _determine_protection_level(self, trigger_count: int) -> ProtectionLevel:
         """
@@ -86,12 +212,28 @@ class VulnerabilityDetector:
         Returns:
             Appropriate ProtectionLevel
         """
-        if trigger_count >= self.escalation_rules['crisis_min']:
-            return ProtectionLevel.CRISIS
-        elif trigger_count >= self.escalation_rules['enhanced_min']:
-            return ProtectionLevel.ENHANCED
-        else:
-            return ProtectionLevel.STANDARD
+        return _level_for_count(self._level_by_count, trigger_count)
+    
+    @staticmethod
+    def _build_level_table(escalation_rules: Mapping[str, Any]) -> Tuple[ProtectionLevel, ...]:
+        """
+        Precompute the protection level for each trigger count up to crisis_min
+        
+        Args:
+            escalation_rules: Thresholds from the specification
+            
+        Returns:
+            Tuple indexed by trigger count; the last entry covers all larger counts
+        """
+        levels = []
+        for count in range(escalation_rules['crisis_min'] + 1):
+            if count >= escalation_rules['crisis_min']:
+                levels.append(ProtectionLevel.CRISIS)
+            elif count >= escalation_rules['enhanced_min']:
+                levels.append(ProtectionLevel.ENHANCED)
+            else:
+                levels.append(ProtectionLevel.STANDARD)
+        return tuple(levels)
     
     def reset_history(self):
         """Clear conversation history"""
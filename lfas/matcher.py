@@ -0,0 +1,229 @@
+"""
+LFAS Protocol v4 - Indicator Matcher
+Compiles vulnerability indicator phrases into flat tables for repeated matching
+"""
+
+import sys
+from bisect import bisect_left
+from functools import lru_cache, partial
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # Optional accelerator: pip install lfas-protocol[fast]
+    ahocorasick = None
+
+
+if sys.version_info >= (3, 10):
+    _popcount = int.bit_count
+else:
+    def _popcount(value: int) -> int:
+        return bin(value).count("1")
+
+
+def _scan_text(
+    scan_table: Tuple[Tuple[int, str], ...],
+    automaton: Optional[object],
+    min_phrase_length: int,
+    text: str
+) -> int:
+    """Scan text against compiled phrase tables, without any result cache"""
+    text_lower = text.lower()
+    hits = 0
+    
+    # Checked after lowercasing, which can change the length of non-ASCII text
+    if len(text_lower) < min_phrase_length:
+        return hits
+    
+    if automaton is not None:
+        # Reports every (possibly overlapping) occurrence in a single pass
+        for _, bit in automaton.iter(text_lower):
+            hits |= bit
+        return hits
+    
+    for bit, phrase in scan_table:
+        if phrase in text_lower:
+            hits |= bit
+    return hits
+
+
+class IndicatorMatcher:
+    """
+    Multi-phrase matcher built once from a category → phrases mapping
+    
+    Phrases are lowercased, deduplicated and numbered at construction;
+    empty phrases are ignored.
+    A scan returns an integer bitset with bit N set when phrase N occurs
+    in the input; the bitset is decoded into counts, categories or phrases
+    only when a caller needs them.
+    
+    When pyahocorasick is installed the phrases are also compiled into an
+    Aho-Corasick automaton so a scan is one pass over the input regardless
+    of phrase count; otherwise each phrase is checked with a substring search.
+    """
+    
+    # Joins batch inputs; a match can never span it unless a phrase contains it
+    _BATCH_SEPARATOR = "\x00"
+    
+    # Recent scan results are memoized per matcher; long inputs bypass the
+    # cache so it never pins large strings in memory
+    SCAN_CACHE_SIZE = 1024
+    SCAN_CACHE_MAX_LENGTH = 1024
+    
+    def __init__(self, indicators: Dict[str, List[str]], use_automaton: bool = True):
+        """
+        Compile indicator phrases
+        
+        Args:
+            indicators: Dictionary mapping category names to indicator phrases
+            use_automaton: Use the Aho-Corasick backend when pyahocorasick is available
+        """
+        self.category_names: Tuple[str, ...] = tuple(indicators)
+        
+        phrase_ids: Dict[str, int] = {}
+        phrase_categories: List[int] = []
+        
+        for category_id, phrases in enumerate(indicators.values()):
+            for phrase in phrases:
+                if not phrase:
+                    # An empty phrase (e.g. from a trailing comma) would match
+                    # every input with substring search but never in the automaton
+                    continue
+                phrase_lower = sys.intern(phrase.lower())
+                if phrase_lower not in phrase_ids:
+                    phrase_ids[phrase_lower] = len(phrase_ids)
+                    phrase_categories.append(0)
+                # A phrase listed under several categories triggers all of them
+                phrase_categories[phrase_ids[phrase_lower]] |= 1 << category_id
+        
+        # Flat, id-indexed tables
+        self.phrases: Tuple[str, ...] = tuple(phrase_ids)
+        self._phrase_categories: Tuple[int, ...] = tuple(phrase_categories)
+        self._scan_table: Tuple[Tuple[int, str], ...] = tuple(
+            (1 << phrase_id, phrase) for phrase_id, phrase in enumerate(self.phrases)
+        )
+        
+        self._batch_separator_safe = not any(
+            self._BATCH_SEPARATOR in phrase for phrase in self.phrases
+        )
+        
+        # Inputs shorter than every phrase cannot match anything
+        self.min_phrase_length = min(map(len, self.phrases), default=0)
+        
+        # Category mask → category names, filled in as masks are first seen
+        self._category_sets: Dict[int, FrozenSet[str]] = {0: frozenset()}
+        
+        self._automaton = None
+        if use_automaton and ahocorasick is not None and self.phrases:
+            automaton = ahocorasick.Automaton()
+            for bit, phrase in self._scan_table:
+                automaton.add_word(phrase, bit)
+            automaton.make_automaton()
+            self._automaton = automaton
+        
+        # Built over the compiled tables rather than a bound method, so the
+        # cache holds no reference back to the matcher
+        self._scan_uncached = partial(
+            _scan_text, self._scan_table, self._automaton, self.min_phrase_length
+        )
+        self._cached_scan = lru_cache(maxsize=self.SCAN_CACHE_SIZE)(self._scan_uncached)
+    
+    @property
+    def backend(self) -> str:
+        """Name of the scanning backend in use"""
+        return "automaton" if self._automaton is not None else "substring"
+    
+    def scan(self, text: str) -> int:
+        """
+        Find which indicator phrases occur in text (case-insensitive)
+        
+        Args:
+            text: Input to scan
+        
+        Returns:
+            Bitset of matched phrase ids
+        """
+        if len(text) <= self.SCAN_CACHE_MAX_LENGTH:
+            return self._cached_scan(text)
+        return self._scan_uncached(text)
+    
+    def clear_cache(self) -> None:
+        """Drop memoized scan results, and with them the input texts they are keyed on"""
+        self._cached_scan.cache_clear()
+    
+    def scan_many(self, texts: List[str]) -> List[int]:
+        """
+        Scan a batch of texts
+        
+        With the automaton backend the lowercased texts are joined with a
+        NUL separator and matched in one pass; each match is assigned back
+        to its text by end offset.
+        
+        Args:
+            texts: Inputs to scan
+            
+        Returns:
+            One bitset of matched phrase ids per text, in input order
+        """
+        if self._automaton is None or not self._batch_separator_safe:
+            return [self.scan(text) for text in texts]
+        
+        lowered = [text.lower() for text in texts]
+        
+        # Offset of the separator following each text
+        separator_offsets = []
+        offset = -1
+        for text_lower in lowered:
+            offset += len(text_lower) + 1
+            separator_offsets.append(offset)
+        
+        results = [0] * len(texts)
+        for end_index, bit in self._automaton.iter(self._BATCH_SEPARATOR.join(lowered)):
+            results[bisect_left(separator_offsets, end_index)] |= bit
+        return results
+    
+    @staticmethod
+    def count(hits: int) -> int:
+        """Number of unique phrases in a scan bitset"""
+        return _popcount(hits)
+    
+    def category_mask(self, hits: int) -> int:
+        """
+        Bitmask of categories triggered by a scan bitset
+        
+        Bit N is set when category N (in the order the indicators were
+        given) has at least one matched phrase.
+        """
+        category_mask = 0
+        for phrase_id in self._iter_ids(hits):
+            category_mask |= self._phrase_categories[phrase_id]
+        return category_mask
+    
+    def categories(self, hits: int) -> FrozenSet[str]:
+        """Category names triggered by a scan bitset"""
+        category_mask = self.category_mask(hits)
+        
+        names = self._category_sets.get(category_mask)
+        if names is None:
+            names = frozenset(
+                name for category_id, name in enumerate(self.category_names)
+                if category_mask >> category_id & 1
+            )
+            self._category_sets[category_mask] = names
+        return names
+    
+    def phrase_ids(self, hits: int) -> List[int]:
+        """Phrase ids present in a scan bitset, in ascending order"""
+        return list(self._iter_ids(hits))
+    
+    def matched_phrases(self, hits: int) -> Set[str]:
+        """Lowercased phrases present in a scan bitset"""
+        return {self.phrases[phrase_id] for phrase_id in self._iter_ids(hits)}
+    
+    @staticmethod
+    def _iter_ids(hits: int):
+        """Yield the phrase ids set in a bitset, lowest first"""
+        while hits:
+            lowest = hits & -hits
+            yield lowest.bit_length() - 1
+            hits ^= lowest
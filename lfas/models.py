@@ -3,20 +3,53 @@ LFAS Protocol v4 - Data Models
 Defines core data structures for vulnerability and crisis detection
 """
 
-from enum import Enum
+import sys
+from enum import Enum, IntEnum
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Tuple
 
 
-class ProtectionLevel(Enum):
-    """Protection levels based on vulnerability signals detected"""
+# Per-detection result objects drop their __dict__ where dataclasses support it
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _freeze(obj, name: str, values: Optional[Iterable]):
+    """Store a sequence field of a frozen dataclass as a tuple"""
+    if values is not None and not isinstance(values, tuple):
+        object.__setattr__(obj, name, tuple(values))
+
+
+class _PrintsByName:
+    """
+    Enum mixin that prints members as "Type.NAME" like a plain Enum
+    
+    Mixed-in int/str enums otherwise format as their bare value in
+    f-strings (and, for IntEnum on Python 3.11+, in str() too).
+    """
+    
+    def __str__(self) -> str:
+        return f"{type(self).__name__}.{self.name}"
+    
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+
+class ProtectionLevel(_PrintsByName, IntEnum):
+    """
+    Protection levels based on vulnerability signals detected
+    Integer-valued so levels compare and index directly
+    """
     STANDARD = 1  # 0 triggers - basic safeguards
     ENHANCED = 2  # 1-2 triggers - vulnerability detected
     CRISIS = 3    # 3+ triggers - immediate danger
 
 
-class CrisisType(Enum):
-    """Types of crisis situations that can be detected"""
+class CrisisType(_PrintsByName, str, Enum):
+    """
+    Types of crisis situations that can be detected
+    String-valued so members compare equal to their specification keys
+    """
     MENTAL_HEALTH = "mental_health"
     FINANCIAL = "financial"
     HEALTH = "health"
@@ -24,70 +57,69 @@ class CrisisType(Enum):
     MIXED = "mixed"  # Multiple crisis types detected
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class DetectionResult:
-    """Result from vulnerability detection analysis"""
+    """Result from vulnerability detection analysis (immutable)"""
     protection_level: ProtectionLevel
     triggers_count: int
-    detected_categories: List[str]
+    detected_categories: FrozenSet[str]
     original_input: str
-    conversation_history: Optional[List[str]] = None
+    conversation_history: Optional[Tuple[str, ...]] = None
+    
+    def __post_init__(self):
+        # Accept any iterable of category names; stored as a frozenset for
+        # O(1) membership checks
+        if not isinstance(self.detected_categories, frozenset):
+            object.__setattr__(self, "detected_categories", frozenset(self.detected_categories))
+        _freeze(self, "conversation_history", self.conversation_history)
     
     def __str__(self) -> str:
         return (
             f"DetectionResult(protection_level={self.protection_level.name}, "
             f"triggers={self.triggers_count}, "
-            f"categories={self.detected_categories})"
+            f"categories={sorted(self.detected_categories)})"
         )
+    
+    def __repr__(self) -> str:
+        # Same summary as str(); skips echoing the input and full history
+        return self.__str__()
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class CrisisResource:
-    """Crisis support resource information"""
+    """Crisis support resource information (immutable)"""
     name: str
     contact: str
     description: str
     available_247: bool = True
 
 
-@dataclass
+# Fixed text of the crisis message, shared by every CrisisResult
+_CRISIS_MESSAGE_HEADER = "⚠️ CRISIS SUPPORT ACTIVATED\n\n"
+_CRISIS_RESOURCES_HEADING = "\n\n📞 IMMEDIATE RESOURCES:"
+_CRISIS_ACTIONS_HEADING = "\n\n🔒 RECOMMENDED ACTIONS:"
+_CRISIS_MESSAGE_FOOTER = "\n\nRemember: You are not alone. Professional help is available 24/7."
+
+
+@dataclass(frozen=True, **_SLOTS)
 class CrisisResult:
-    """Result from crisis assessment"""
+    """Result from crisis assessment (immutable)"""
     crisis_type: CrisisType
     protection_level: ProtectionLevel
-    detected_indicators: List[str]
-    primary_resources: List[CrisisResource]
-    recommended_actions: List[str]
+    detected_indicators: Tuple[str, ...]
+    primary_resources: Tuple[CrisisResource, ...]
+    recommended_actions: Tuple[str, ...]
     user_message: str
     
+    def __post_init__(self):
+        # Accept any iterables; stored as tuples so results are hashable
+        _freeze(self, "detected_indicators", self.detected_indicators)
+        _freeze(self, "primary_resources", self.primary_resources)
+        _freeze(self, "recommended_actions", self.recommended_actions)
+    
     def format_crisis_message(self) -> str:
-        """Format a user-facing crisis response message"""
-        message_parts = [
-            "⚠️ CRISIS SUPPORT ACTIVATED",
-            "",
-            self.user_message,
-            "",
-            "📞 IMMEDIATE RESOURCES:",
-        ]
-        
-        for resource in self.primary_resources:
-            message_parts.append(f"• {resource.name}: {resource.contact}")
-            message_parts.append(f"  {resource.description}")
-        
-        message_parts.extend([
-            "",
-            "🔒 RECOMMENDED ACTIONS:",
-        ])
-        
-        for action in self.recommended_actions:
-            message_parts.append(f"• {action}")
-        
-        message_parts.extend([
-            "",
-            "Remember: You are not alone. Professional help is available 24/7.",
-        ])
-        
-        return "\n".join(message_parts)
+        """Format a user-facing crisis response message (built once per distinct result)"""
+        return _format_crisis_message(self)
     
     def __str__(self) -> str:
         return (
@@ -95,3 +127,25 @@ class CrisisResult:
             f"level={self.protection_level.name}, "
             f"resources={len(self.primary_resources)})"
         )
+    
+    def __repr__(self) -> str:
+        # Same summary as str(); skips the message text and full resource list
+        return self.__str__()
+
+
+@lru_cache(maxsize=256)
+def _format_crisis_message(result: CrisisResult) -> str:
+    """Build the crisis message for a result; keyed on the immutable result itself"""
+    message_parts = [_CRISIS_MESSAGE_HEADER, result.user_message, _CRISIS_RESOURCES_HEADING]
+    
+    for resource in result.primary_resources:
+        message_parts.append(f"\n• {resource.name}: {resource.contact}\n  {resource.description}")
+    
+    message_parts.append(_CRISIS_ACTIONS_HEADING)
+    
+    for action in result.recommended_actions:
+        message_parts.append(f"\n• {action}")
+    
+    message_parts.append(_CRISIS_MESSAGE_FOOTER)
+    
+    return "".join(message_parts)
@@ -3,11 +3,129 @@ LFAS Protocol v4 - Specification Loader
 Dynamically parses XML specification to extract detection indicators and crisis resources
 """
 
+import copy
+import errno
+import sys
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from functools import wraps
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Any, Tuple, TypeVar
 from pathlib import Path
 
 
+T = TypeVar("T")
+
+
+# Default specification shipped in the protocol directory next to the package
+DEFAULT_SPEC_PATH = Path(__file__).parent.parent / "protocol" / "lfas-v4-specification.xml"
+
+# Number of specification files whose parsed or compiled forms each cache
+# keeps; the least recently used file is dropped beyond this
+SPEC_CACHE_MAX_FILES = 8
+
+# stat() errors that Path.exists() reports as a missing file
+_MISSING_FILE_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP})
+
+
+def spec_cache_key(spec_path: Optional[str] = None) -> Tuple[str, int]:
+    """
+    Identify a specification file for caching work derived from it
+    
+    Args:
+        spec_path: Path to XML specification file. If None, uses default location.
+        
+    Returns:
+        Tuple of (resolved path, modification time in ns)
+    """
+    path = Path(spec_path) if spec_path is not None else DEFAULT_SPEC_PATH
+    try:
+        # One stat both checks existence and reads the mtime; also treat a
+        # non-directory or looping path component as a missing file
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError as exc:
+        if exc.errno not in _MISSING_FILE_ERRNOS:
+            raise
+        raise FileNotFoundError(f"Specification file not found: {path}") from None
+    return str(path.resolve()), mtime_ns
+
+
+def spec_cached(
+    cache: "OrderedDict[str, Tuple[int, T]]",
+    spec_path: Optional[str],
+    build: Callable[[str], T]
+) -> T:
+    """
+    Reuse work derived from a specification file while the file is unchanged
+    
+    Each file has at most one entry, replaced when its modification time
+    changes, and at most SPEC_CACHE_MAX_FILES files are kept.
+    
+    Args:
+        cache: Mapping of resolved path to (modification time, value)
+        spec_path: Path to XML specification file. If None, uses default location.
+        build: Called with the resolved path to produce the value on a miss
+        
+    Returns:
+        The cached or newly built value
+    """
+    resolved_path, mtime_ns = spec_cache_key(spec_path)
+    entry = cache.get(resolved_path)
+    if entry is not None and entry[0] == mtime_ns:
+        cache.move_to_end(resolved_path)
+        return entry[1]
+    
+    value = build(resolved_path)
+    cache[resolved_path] = (mtime_ns, value)
+    cache.move_to_end(resolved_path)
+    if len(cache) > SPEC_CACHE_MAX_FILES:
+        cache.popitem(last=False)
+    return value
+
+
+def read_only_sections(sections: Mapping[str, Iterable[T]]) -> Mapping[str, Tuple[T, ...]]:
+    """
+    Read-only view of specification data shared between detectors
+    
+    Detectors compile matchers and lookup tables from their specification
+    data once, so an edit to it could never take effect; the view makes
+    such an edit raise instead of being silently ignored.
+    
+    Args:
+        sections: Mapping of names to sequences of values
+        
+    Returns:
+        MappingProxyType with each sequence stored as a tuple
+    """
+    return MappingProxyType({name: tuple(values) for name, values in sections.items()})
+
+
+# Parsed trees, shared between loaders and never handed out to callers
+_PARSED_SPECS: "OrderedDict[str, Tuple[int, ET.ElementTree]]" = OrderedDict()
+
+
+def _memoized(method):
+    """
+    Cache a loader method's mapping of names to phrase lists on the instance
+    
+    The parsed tree never changes under a loader, so each section is
+    extracted once. Every call returns new dicts and lists (the phrases
+    themselves are immutable), so callers may modify the result without
+    affecting later calls.
+    """
+    name = method.__name__
+    
+    @wraps(method)
+    def wrapper(self):
+        try:
+            result = self._memo[name]
+        except KeyError:
+            result = self._memo[name] = method(self)
+        return {key: list(values) for key, values in result.items()}
+    
+    return wrapper
+
+
 class SpecificationLoader:
     """Loads and parses LFAS XML specification for dynamic detection"""
     
@@ -19,17 +137,33 @@ class SpecificationLoader:
             spec_path: Path to XML specification file. If None, uses default location.
         """
         if spec_path is None:
-            # Default to protocol directory relative to this file
-            base_dir = Path(__file__).parent.parent
-            spec_path = base_dir / "protocol" / "lfas-v4-specification.xml"
+            spec_path = DEFAULT_SPEC_PATH
         
         self.spec_path = Path(spec_path)
-        if not self.spec_path.exists():
-            raise FileNotFoundError(f"Specification file not found: {self.spec_path}")
+        # Sections are extracted from the parsed tree shared between loaders;
+        # callers only ever see a private copy through tree/root
+        self._shared_root = spec_cached(_PARSED_SPECS, self.spec_path, ET.parse).getroot()
+        self._tree: Optional[ET.ElementTree] = None
+        self._memo: Dict[str, Any] = {}
+    
+    @property
+    def tree(self) -> ET.ElementTree:
+        """
+        This loader's own copy of the parsed specification
         
-        self.tree = ET.parse(str(self.spec_path))
-        self.root = self.tree.getroot()
+        Copied on first access; editing it does not change what this or
+        any other loader extracts.
+        """
+        if self._tree is None:
+            self._tree = ET.ElementTree(copy.deepcopy(self._shared_root))
+        return self._tree
+    
+    @property
+    def root(self) -> ET.Element:
+        """Root element of this loader's own copy of the specification"""
+        return self.tree.getroot()
     
+    @_memoized
     def load_vulnerability_indicators(self) -> Dict[str, List[str]]:
         """
         Extract vulnerability detection indicators from XML spec
@@ -40,7 +174,7 @@ class SpecificationLoader:
         indicators = {}
         
         # Find the vulnerability detection engine section
-        detection_engine = self.root.find(".//vulnerability_detection_engine")
+        detection_engine = self._shared_root.find(".//vulnerability_detection_engine")
         if detection_engine is None:
             return indicators
         
@@ -49,15 +183,16 @@ class SpecificationLoader:
         if detection_indicators is None:
             return indicators
         
-        # Parse each category
+        # Parse each category; names and phrases are interned since they are
+        # reused as keys and match results for the life of the process
         for category in detection_indicators:
-            category_name = category.tag
+            category_name = sys.intern(category.tag)
             category_indicators = []
             
             for indicator_elem in category.findall("indicator"):
                 if indicator_elem.text:
                     # Split comma-separated indicators
-                    phrases = [phrase.strip() for phrase in indicator_elem.text.split(',')]
+                    phrases = [sys.intern(phrase.strip()) for phrase in indicator_elem.text.split(',')]
                     category_indicators.extend(phrases)
             
             if category_indicators:
@@ -81,13 +216,14 @@ class SpecificationLoader:
         }
         
         # Could parse from XML if rules become more complex
-        escalation = self.root.find(".//protection_escalation_rules")
+        escalation = self._shared_root.find(".//protection_escalation_rules")
         if escalation is not None:
             # For now, use hardcoded defaults based on spec
             pass
         
         return rules
     
+    @_memoized
     def load_crisis_indicators(self) -> Dict[str, List[str]]:
         """
         Extract crisis-specific indicators from VR-24
@@ -98,7 +234,7 @@ class SpecificationLoader:
         crisis_indicators = {}
         
         # Find VR-24 (Crisis Detection & Response)
-        vr24 = self.root.find(".//VR-24")
+        vr24 = self._shared_root.find(".//VR-24")
         if vr24 is None:
             return crisis_indicators
         
@@ -203,7 +339,7 @@ class SpecificationLoader:
             Dictionary with version, creator, status, etc.
         """
         metadata = {}
-        meta_elem = self.root.find("metadata")
+        meta_elem = self._shared_root.find("metadata")
         
         if meta_elem is not None:
             for child in meta_elem:
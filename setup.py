@@ -8,6 +8,9 @@ setup(
         "lxml>=4.9.0",
         "requests>=2.31.0"
     ],
+    extras_require={
+        "fast": ["pyahocorasick>=2.0"],
+    },
     author="Mehmet Bagbozan",
     author_email="lfasprotocol@outlook.com",
     description="Logical Framework for AI Safety - Protecting Vulnerable Users",
@@ -0,0 +1,27 @@
+"""
+Shared fixtures for the LFAS test suite
+"""
+
+import pytest
+
+from lfas.crisis import CrisisDetector
+from lfas.detector import VulnerabilityDetector
+from lfas.specification_loader import SpecificationLoader
+
+
+@pytest.fixture(scope="session")
+def spec_loader():
+    """Specification loader for the default spec; loaders hold no per-test state"""
+    return SpecificationLoader()
+
+
+@pytest.fixture(scope="session")
+def crisis_detector():
+    """Crisis detector for the default spec; assessments hold no per-test state"""
+    return CrisisDetector()
+
+
+@pytest.fixture(scope="session")
+def vulnerability_detector():
+    """History-free vulnerability detector for the default spec, shared by all tests"""
+    return VulnerabilityDetector(maintain_history=False)
@@ -2,9 +2,15 @@
 Tests for CrisisDetector
 """
 
+import itertools
+
+import pytest
+
+from lfas import clear_caches
 from lfas.detector import VulnerabilityDetector
 from lfas.crisis import CrisisDetector
-from lfas.models import ProtectionLevel, CrisisType
+from lfas.specification_loader import DEFAULT_SPEC_PATH
+from lfas.models import DetectionResult, ProtectionLevel, CrisisType
 
 
 class TestCrisisDetector:
@@ -16,116 +22,113 @@ class TestCrisisDetector:
         assert detector.crisis_resources is not None
         assert detector.crisis_keywords is not None
     
-    def test_assess_crisis_mental_health(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
-        result = vulnerability.detect("last hope, can't take it anymore, nobody understands")
-        crisis_result = crisis.assess_crisis(result)
-        
-        assert crisis_result.protection_level == ProtectionLevel.CRISIS
-        assert crisis_result.crisis_type == CrisisType.MENTAL_HEALTH
-        assert len(crisis_result.primary_resources) > 0
-        assert len(crisis_result.recommended_actions) > 0
+    def test_crisis_data_shared_and_read_only(self):
+        detector = CrisisDetector()
+        other = CrisisDetector(str(DEFAULT_SPEC_PATH))
+        
+        assert detector.crisis_resources is other.crisis_resources
+        with pytest.raises(TypeError):
+            detector.crisis_resources['mental_health'][0]['contact'] = '000'
+        with pytest.raises(AttributeError):
+            detector.crisis_indicators['mental_health'].append('custom')
+        with pytest.raises(AttributeError):
+            detector.crisis_keywords['abuse'].append('he hits me')
     
-    def test_assess_crisis_financial(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
-        result = vulnerability.detect("lost my job, need money fast, can't pay bills")
-        crisis_result = crisis.assess_crisis(result)
-        
-        assert crisis_result.protection_level == ProtectionLevel.CRISIS
-        assert crisis_result.crisis_type == CrisisType.FINANCIAL
+    def test_primary_crisis_for_every_combination(self, crisis_detector):
+        keywords = {
+            CrisisType.MENTAL_HEALTH: "suicidal",
+            CrisisType.FINANCIAL: "bankrupt",
+            CrisisType.HEALTH: "seriously ill",
+            CrisisType.ABUSE: "being abused",
+        }
+        
+        for size in range(len(keywords) + 1):
+            for detected in itertools.combinations(keywords, size):
+                result = crisis_detector.assess_crisis(DetectionResult(
+                    protection_level=ProtectionLevel.CRISIS,
+                    triggers_count=3,
+                    detected_categories=[],
+                    original_input=", ".join(keywords[t] for t in detected) or "last hope"
+                ))
+                
+                if len(detected) == 1:
+                    assert result.crisis_type == detected[0]
+                elif CrisisType.MENTAL_HEALTH in detected or not detected:
+                    assert result.crisis_type == CrisisType.MENTAL_HEALTH
+                else:
+                    assert result.crisis_type == CrisisType.MIXED
     
-    def test_assess_crisis_health(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
-        result = vulnerability.detect("can't see a doctor, pain won't stop, no medical help")
-        crisis_result = crisis.assess_crisis(result)
+    @pytest.mark.parametrize("text, crisis_type", [
+        ("last hope, can't take it anymore, nobody understands", CrisisType.MENTAL_HEALTH),
+        ("lost my job, need money fast, can't pay bills", CrisisType.FINANCIAL),
+        ("can't see a doctor, pain won't stop, no medical help", CrisisType.HEALTH),
+    ], ids=["mental_health", "financial", "health"])
+    def test_assess_crisis_type(self, crisis_detector, vulnerability_detector, text, crisis_type):
+        result = vulnerability_detector.detect(text)
+        crisis_result = crisis_detector.assess_crisis(result)
         
         assert crisis_result.protection_level == ProtectionLevel.CRISIS
-        assert crisis_result.crisis_type == CrisisType.HEALTH
+        assert crisis_result.crisis_type == crisis_type
+        assert len(crisis_result.primary_resources) > 0
+        assert len(crisis_result.recommended_actions) > 0
     
-    def test_assess_crisis_abuse(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
+    def test_assess_crisis_abuse(self, crisis_detector, vulnerability_detector):
         # Need to trigger crisis level with XML indicators + abuse keywords
-        result = vulnerability.detect("partner hurts me, domestic violence, lost my job, can't take it anymore, only chance")
-        crisis_result = crisis.assess_crisis(result)
+        result = vulnerability_detector.detect("partner hurts me, domestic violence, lost my job, can't take it anymore, only chance")
+        crisis_result = crisis_detector.assess_crisis(result)
         
         assert crisis_result.protection_level == ProtectionLevel.CRISIS
         # Should detect abuse in crisis keywords (or mixed/financial due to indicators)
         assert crisis_result.crisis_type in [CrisisType.ABUSE, CrisisType.MIXED, CrisisType.FINANCIAL, CrisisType.MENTAL_HEALTH]
     
-    def test_mental_health_priority_in_mixed_crisis(self):
+    def test_mental_health_priority_in_mixed_crisis(self, crisis_detector, vulnerability_detector):
         """Mental health should be prioritized when multiple crisis types detected"""
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
         # Mixed crisis with mental health component
-        result = vulnerability.detect(
+        result = vulnerability_detector.detect(
             "lost my job, want to die, can't afford medication, thinking about suicide"
         )
-        crisis_result = crisis.assess_crisis(result)
+        crisis_result = crisis_detector.assess_crisis(result)
         
         # Mental health should be primary even if other types detected
         assert crisis_result.crisis_type == CrisisType.MENTAL_HEALTH
     
-    def test_mixed_crisis_without_mental_health(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
-        result = vulnerability.detect(
+    def test_mixed_crisis_without_mental_health(self, crisis_detector, vulnerability_detector):
+        result = vulnerability_detector.detect(
             "lost my job, can't see a doctor, pain won't stop"
         )
-        crisis_result = crisis.assess_crisis(result)
+        crisis_result = crisis_detector.assess_crisis(result)
         
         # Should be MIXED or one of the detected types
         assert crisis_result.crisis_type in [CrisisType.MIXED, CrisisType.FINANCIAL, CrisisType.HEALTH]
     
-    def test_non_crisis_level_handling(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
+    def test_non_crisis_level_handling(self, crisis_detector, vulnerability_detector):
         # Enhanced but not crisis level
-        result = vulnerability.detect("lost my job")
-        crisis_result = crisis.assess_crisis(result)
+        result = vulnerability_detector.detect("lost my job")
+        crisis_result = crisis_detector.assess_crisis(result)
         
         # Should still return a result but indicate no crisis
         assert crisis_result is not None
         assert len(crisis_result.primary_resources) == 0
     
-    def test_resources_include_988(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
-        result = vulnerability.detect("thinking about suicide, only chance, last hope, can't take it anymore")
-        crisis_result = crisis.assess_crisis(result)
+    def test_resources_include_988(self, crisis_detector, vulnerability_detector):
+        result = vulnerability_detector.detect("thinking about suicide, only chance, last hope, can't take it anymore")
+        crisis_result = crisis_detector.assess_crisis(result)
         
         # Check for 988 in resources
         has_988 = any("988" in r.contact for r in crisis_result.primary_resources)
         assert has_988, "988 Suicide & Crisis Lifeline should be included"
     
-    def test_resources_include_crisis_text_line(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
-        result = vulnerability.detect("thinking about suicide, only chance, last hope, can't take it anymore")
-        crisis_result = crisis.assess_crisis(result)
+    def test_resources_include_crisis_text_line(self, crisis_detector, vulnerability_detector):
+        result = vulnerability_detector.detect("thinking about suicide, only chance, last hope, can't take it anymore")
+        crisis_result = crisis_detector.assess_crisis(result)
         
         # Check for Crisis Text Line
         has_text_line = any("741741" in r.contact for r in crisis_result.primary_resources)
         assert has_text_line, "Crisis Text Line should be included"
     
-    def test_format_crisis_message_structure(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
-        result = vulnerability.detect("suicidal, can't go on, nobody cares")
-        crisis_result = crisis.assess_crisis(result)
+    def test_format_crisis_message_structure(self, crisis_detector, vulnerability_detector):
+        result = vulnerability_detector.detect("suicidal, can't go on, nobody cares")
+        crisis_result = crisis_detector.assess_crisis(result)
         
         message = crisis_result.format_crisis_message()
         
@@ -135,12 +138,9 @@ class TestCrisisDetector:
         assert "RECOMMENDED ACTIONS" in message
         assert "not alone" in message.lower()
     
-    def test_format_crisis_message_includes_resources(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
-        result = vulnerability.detect("thinking about ending it, last chance, nobody understands")
-        crisis_result = crisis.assess_crisis(result)
+    def test_format_crisis_message_includes_resources(self, crisis_detector, vulnerability_detector):
+        result = vulnerability_detector.detect("thinking about ending it, last chance, nobody understands")
+        crisis_result = crisis_detector.assess_crisis(result)
         
         message = crisis_result.format_crisis_message()
         
@@ -149,12 +149,9 @@ class TestCrisisDetector:
             assert resource.name in message
             assert resource.contact in message
     
-    def test_format_crisis_message_includes_actions(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
-        result = vulnerability.detect("suicidal thoughts, can't take it, nobody cares")
-        crisis_result = crisis.assess_crisis(result)
+    def test_format_crisis_message_includes_actions(self, crisis_detector, vulnerability_detector):
+        result = vulnerability_detector.detect("suicidal thoughts, can't take it, nobody cares")
+        crisis_result = crisis_detector.assess_crisis(result)
         
         message = crisis_result.format_crisis_message()
         
@@ -162,37 +159,41 @@ class TestCrisisDetector:
         for action in crisis_result.recommended_actions:
             assert action in message
     
-    def test_detected_indicators_extracted(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
-        result = vulnerability.detect("thinking about suicide, want to die, only chance, last hope, can't take it anymore")
-        crisis_result = crisis.assess_crisis(result)
+    def test_detected_indicators_extracted(self, crisis_detector, vulnerability_detector):
+        result = vulnerability_detector.detect("thinking about suicide, want to die, only chance, last hope, can't take it anymore")
+        crisis_result = crisis_detector.assess_crisis(result)
         
         # Should have detected some indicators
         assert len(crisis_result.detected_indicators) > 0
     
-    def test_user_message_appropriate_for_crisis_type(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
+    def test_detected_indicators_in_keyword_table_order(self, crisis_detector, vulnerability_detector):
+        result = vulnerability_detector.detect(
+            "pain won't stop, declared bankruptcy, want to die, last hope, can't take it anymore"
+        )
+        crisis_result = crisis_detector.assess_crisis(result)
+        
+        # Overlapping keywords are all reported, grouped by crisis type
+        assert crisis_result.detected_indicators == (
+            "mental_health: 'want to die'",
+            "financial: 'bankrupt'",
+            "financial: 'bankruptcy'",
+            "health: 'pain won't stop'",
+        )
+    
+    def test_user_message_appropriate_for_crisis_type(self, crisis_detector, vulnerability_detector):
         # Mental health crisis
-        result = vulnerability.detect("thinking about suicide, only chance, last hope, can't take it anymore")
-        crisis_result = crisis.assess_crisis(result)
+        result = vulnerability_detector.detect("thinking about suicide, only chance, last hope, can't take it anymore")
+        crisis_result = crisis_detector.assess_crisis(result)
         assert "difficult time" in crisis_result.user_message.lower() or "safety" in crisis_result.user_message.lower()
         
         # Financial crisis
-        vulnerability.reset_history()
-        result = vulnerability.detect("lost my job, need money fast, can't pay bills")
-        crisis_result = crisis.assess_crisis(result)
+        result = vulnerability_detector.detect("lost my job, need money fast, can't pay bills")
+        crisis_result = crisis_detector.assess_crisis(result)
         assert "financial" in crisis_result.user_message.lower()
     
-    def test_recommended_actions_appropriate(self):
-        vulnerability = VulnerabilityDetector()
-        crisis = CrisisDetector()
-        
-        result = vulnerability.detect("thinking about suicide, only chance, last hope, can't take it anymore")
-        crisis_result = crisis.assess_crisis(result)
+    def test_recommended_actions_appropriate(self, crisis_detector, vulnerability_detector):
+        result = vulnerability_detector.detect("thinking about suicide, only chance, last hope, can't take it anymore")
+        crisis_result = crisis_detector.assess_crisis(result)
         
         # Should have multiple recommended actions
         assert len(crisis_result.recommended_actions) > 0
@@ -202,14 +203,14 @@ class TestCrisisDetector:
             assert isinstance(action, str)
             assert len(action) > 0
     
-    def test_end_to_end_example_from_spec(self):
+    def test_end_to_end_example_from_spec(self, crisis_detector):
         """Test the example from the problem specification"""
         detector = VulnerabilityDetector()
         result = detector.detect("I lost my job, this is my last hope, can't take it anymore")
         
         assert result.protection_level.value >= 3
         
-        crisis = CrisisDetector().assess_crisis(result)
+        crisis = crisis_detector.assess_crisis(result)
         message = crisis.format_crisis_message()
         
         # Verify output structure
@@ -217,3 +218,65 @@ class TestCrisisDetector:
         assert len(message) > 0
         assert "CRISIS" in message
         assert len(crisis.primary_resources) > 0
+    
+    def test_resources_shared_across_assessments(self, crisis_detector, vulnerability_detector):
+        first = crisis_detector.assess_crisis(vulnerability_detector.detect("last hope, can't take it anymore, nobody understands"))
+        second = crisis_detector.assess_crisis(vulnerability_detector.detect("Nobody understands. This is my last hope, I can't take it anymore"))
+        
+        assert first.primary_resources is second.primary_resources
+        assert len(first.primary_resources) == len(crisis_detector.crisis_resources['mental_health'])
+    
+    def test_repeated_input_reuses_assessment(self, crisis_detector, vulnerability_detector):
+        text = "I lost my job, this is my last hope, can't take it anymore"
+        
+        first = crisis_detector.assess_crisis(vulnerability_detector.detect(text))
+        second = crisis_detector.assess_crisis(vulnerability_detector.detect(text))
+        other = crisis_detector.assess_crisis(vulnerability_detector.detect("Suicidal, last hope, can't take it anymore"))
+        
+        assert second is first
+        assert other is not first
+        assert other.crisis_type == CrisisType.MENTAL_HEALTH
+    
+    def test_assessments_shared_between_detectors(self, crisis_detector, vulnerability_detector):
+        result = vulnerability_detector.detect("I lost my job, this is my last hope, can't take it anymore")
+        
+        assert CrisisDetector().assess_crisis(result) is crisis_detector.assess_crisis(result)
+    
+    def test_clear_caches_releases_messages(self, crisis_detector, vulnerability_detector):
+        text = "I lost my job, this is my last hope, can't take it anymore"
+        detection = vulnerability_detector.detect(text)
+        assessment = crisis_detector.assess_crisis(detection)
+        
+        clear_caches()
+        
+        new_detection = vulnerability_detector.detect(text)
+        assert new_detection == detection and new_detection is not detection
+        new_assessment = crisis_detector.assess_crisis(detection)
+        assert new_assessment == assessment and new_assessment is not assessment
+    
+    def test_long_input_bypasses_assessment_cache(self, crisis_detector, vulnerability_detector):
+        text = "last hope, can't take it anymore, nobody understands " * 40
+        assert len(text) > CrisisDetector.ASSESS_CACHE_MAX_LENGTH
+        
+        first = crisis_detector.assess_crisis(vulnerability_detector.detect(text))
+        second = crisis_detector.assess_crisis(vulnerability_detector.detect(text))
+        
+        assert second is not first
+        assert second == first
+    
+    def test_actions_and_messages_shared_per_crisis_type(self, crisis_detector, vulnerability_detector):
+        first = crisis_detector.assess_crisis(vulnerability_detector.detect("lost my job, need money fast, can't pay bills"))
+        second = crisis_detector.assess_crisis(vulnerability_detector.detect("I lost my job, need money fast and can't pay bills"))
+        
+        assert first.crisis_type == second.crisis_type == CrisisType.FINANCIAL
+        assert first.recommended_actions is second.recommended_actions
+        assert first.recommended_actions[-1] == "If in immediate danger, call emergency services (911)"
+        assert first.user_message is second.user_message
+    
+    def test_non_crisis_result_shared_per_level(self, crisis_detector, vulnerability_detector):
+        first = crisis_detector.assess_crisis(vulnerability_detector.detect("lost my job"))
+        second = crisis_detector.assess_crisis(vulnerability_detector.detect("can't pay bills"))
+        
+        assert first is second
+        assert first.protection_level == ProtectionLevel.ENHANCED
+        assert first.primary_resources == ()
@@ -2,7 +2,15 @@
 Tests for VulnerabilityDetector
 """
 
+import gc
+import shutil
+import weakref
+
+import pytest
+
 from lfas.detector import VulnerabilityDetector
+from lfas.matcher import IndicatorMatcher
+from lfas.specification_loader import DEFAULT_SPEC_PATH
 from lfas.models import ProtectionLevel
 
 
@@ -16,6 +24,28 @@ class TestVulnerabilityDetector:
         assert detector.escalation_rules is not None
         assert detector.conversation_history == []
     
+    def test_compiled_spec_separate_per_file(self, tmp_path):
+        spec_copy = tmp_path / "spec.xml"
+        shutil.copy(DEFAULT_SPEC_PATH, spec_copy)
+        
+        default = VulnerabilityDetector()
+        custom = VulnerabilityDetector(str(spec_copy))
+        
+        assert custom.indicators is not default.indicators
+        assert custom.indicators == default.indicators
+    
+    def test_indicators_shared_and_read_only(self):
+        detector = VulnerabilityDetector()
+        other = VulnerabilityDetector(str(DEFAULT_SPEC_PATH))
+        
+        assert detector.indicators is other.indicators
+        with pytest.raises(TypeError):
+            detector.indicators['custom'] = ('purple elephant',)
+        with pytest.raises(AttributeError):
+            detector.indicators['crisis_language'].append('purple elephant')
+        with pytest.raises(TypeError):
+            detector.escalation_rules['crisis_min'] = 2
+    
     def test_detect_standard_protection(self):
         detector = VulnerabilityDetector()
         result = detector.detect("Hello, how are you today?")
@@ -24,6 +54,14 @@ class TestVulnerabilityDetector:
         assert result.triggers_count == 0
         assert len(result.detected_categories) == 0
     
+    def test_detect_no_triggers_keeps_history(self):
+        detector = VulnerabilityDetector()
+        detector.detect("Hi")
+        result = detector.detect("Hi, I need help with my project")
+        
+        assert result.detected_categories == frozenset()
+        assert result.conversation_history == ("Hi", "Hi, I need help with my project")
+    
     def test_detect_enhanced_protection_single_trigger(self):
         detector = VulnerabilityDetector()
         result = detector.detect("I lost my job last week")
@@ -54,29 +92,17 @@ class TestVulnerabilityDetector:
         assert result.protection_level == ProtectionLevel.CRISIS
         assert result.triggers_count >= 3
     
-    def test_detect_categories_crisis_language(self):
-        detector = VulnerabilityDetector()
-        result = detector.detect("this is my last hope and only chance")
-        
-        assert "crisis_language" in result.detected_categories
-    
-    def test_detect_categories_financial(self):
-        detector = VulnerabilityDetector()
-        result = detector.detect("lost my job and desperate for income")
-        
-        assert "financial_desperation" in result.detected_categories
-    
-    def test_detect_categories_health(self):
-        detector = VulnerabilityDetector()
-        result = detector.detect("can't see a doctor and pain won't stop")
-        
-        assert "health_crisis" in result.detected_categories
-    
-    def test_detect_categories_isolation(self):
+    @pytest.mark.parametrize("text, category", [
+        ("this is my last hope and only chance", "crisis_language"),
+        ("lost my job and desperate for income", "financial_desperation"),
+        ("can't see a doctor and pain won't stop", "health_crisis"),
+        ("no one to talk to and you're the only one who listens", "isolation_indicators"),
+    ], ids=["crisis_language", "financial", "health", "isolation"])
+    def test_detect_categories(self, text, category):
         detector = VulnerabilityDetector()
-        result = detector.detect("no one to talk to and you're the only one who listens")
+        result = detector.detect(text)
         
-        assert "isolation_indicators" in result.detected_categories
+        assert category in result.detected_categories
     
     def test_conversation_history_tracking(self):
         detector = VulnerabilityDetector()
@@ -111,6 +137,44 @@ class TestVulnerabilityDetector:
         assert "Previous context 1" in result.conversation_history
         assert "New message" in result.conversation_history
     
+    def test_conversation_history_optional(self):
+        detector = VulnerabilityDetector(maintain_history=False)
+        
+        detector.detect("First message")
+        result = detector.detect("lost my job", conversation_history=["Earlier"])
+        
+        assert result.conversation_history is None
+        assert result.protection_level == ProtectionLevel.ENHANCED
+        assert detector.conversation_history == []
+    
+    def test_stateless_results_shared(self):
+        detector = VulnerabilityDetector(maintain_history=False)
+        
+        first = detector.detect("I lost my job, this is my last hope")
+        assert detector.detect("I lost my job, this is my last hope") is first
+        assert VulnerabilityDetector(maintain_history=False).detect("I lost my job, this is my last hope") is first
+        assert detector.detect("Hello") != first
+    
+    def test_stateless_long_input_not_cached(self):
+        detector = VulnerabilityDetector(maintain_history=False)
+        text = "x" * IndicatorMatcher.SCAN_CACHE_MAX_LENGTH + " I lost my job"
+        
+        first = detector.detect(text)
+        assert first.triggers_count == 1
+        assert detector.detect(text) == first
+        assert detector.detect(text) is not first
+    
+    def test_detector_freed_without_cycle_collection(self):
+        gc.disable()
+        try:
+            detector = VulnerabilityDetector(maintain_history=False)
+            detector.detect("I lost my job")
+            ref = weakref.ref(detector)
+            del detector
+            assert ref() is None
+        finally:
+            gc.enable()
+    
     def test_reset_history(self):
         detector = VulnerabilityDetector()
         
@@ -164,3 +228,69 @@ class TestVulnerabilityDetector:
         detector.reset_history()
         result3 = detector.detect("lost my job, can't take it anymore, this is my last hope")
         assert result3.protection_level == ProtectionLevel.CRISIS
+    
+    def test_detect_level_only_matches_detect(self):
+        detector = VulnerabilityDetector()
+        inputs = [
+            "Hello, how are you today?",
+            "I lost my job and can't pay bills",
+            "I lost my job, this is my last hope, can't take it anymore",
+        ]
+        
+        for text in inputs:
+            level, count = detector.detect_level_only(text)
+            result = detector.detect(text)
+            assert level == result.protection_level
+            assert count == result.triggers_count
+    
+    def test_detect_level_only_does_not_touch_history(self):
+        detector = VulnerabilityDetector()
+        detector.detect("First message")
+        
+        level, count = detector.detect_level_only("lost my job")
+        
+        assert level == ProtectionLevel.ENHANCED
+        assert count == 1
+        assert detector.conversation_history == ["First message"]
+    
+    def test_protection_level_for_every_trigger_count(self):
+        detector = VulnerabilityDetector()
+        expected = [
+            ProtectionLevel.STANDARD,
+            ProtectionLevel.ENHANCED,
+            ProtectionLevel.ENHANCED,
+            ProtectionLevel.CRISIS,
+            ProtectionLevel.CRISIS,
+            ProtectionLevel.CRISIS,
+        ]
+        
+        # Distinct indicators that don't contain one another, so each adds one trigger
+        phrases = []
+        for phrase in (p for category in detector.indicators.values() for p in category):
+            if detector.detect_level_only(", ".join(phrases + [phrase]))[1] == len(phrases) + 1:
+                phrases.append(phrase)
+            if len(phrases) == len(expected) - 1:
+                break
+        
+        for count, level in enumerate(expected):
+            assert detector.detect_level_only(", ".join(phrases[:count])) == (level, count)
+    
+    def test_detect_many(self):
+        detector = VulnerabilityDetector()
+        texts = [
+            "Hello, how are you today?",
+            "I lost my job",
+            "I lost my job, this is my last hope, can't take it anymore",
+        ]
+        
+        results = detector.detect_many(texts)
+        
+        assert [r.protection_level for r in results] == [
+            ProtectionLevel.STANDARD, ProtectionLevel.ENHANCED, ProtectionLevel.CRISIS
+        ]
+        for text, result in zip(texts, results):
+            single = detector.detect_level_only(text)
+            assert result.original_input == text
+            assert (result.protection_level, result.triggers_count) == single
+            assert result.conversation_history is None
+        assert detector.conversation_history == []
@@ -0,0 +1,184 @@
+"""
+Tests for IndicatorMatcher
+"""
+
+import gc
+import weakref
+
+import pytest
+
+from lfas.matcher import IndicatorMatcher
+
+
+INDICATORS = {
+    "crisis_language": ["last hope", "completely alone", "Can't take it anymore"],
+    "financial_desperation": ["lost my job", "last $100"],
+    "isolation_indicators": ["completely alone in this", "no one to talk to"],
+}
+
+
+class CountingStr(str):
+    """String that counts how often it is lowercased, i.e. actually scanned"""
+    
+    lower_calls = 0
+    
+    def lower(self):
+        self.lower_calls += 1
+        return super().lower()
+
+
+class TestIndicatorMatcher:
+    """Test compiled indicator matching"""
+    
+    def test_phrases_lowercased_and_numbered(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        assert "can't take it anymore" in matcher.phrases
+        assert len(matcher.phrases) == 7
+        assert matcher.category_names == tuple(INDICATORS)
+    
+    def test_no_match(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        hits = matcher.scan("Hello, how are you today?")
+        
+        assert hits == 0
+        assert matcher.count(hits) == 0
+        assert matcher.categories(hits) == set()
+        assert matcher.matched_phrases(hits) == set()
+    
+    def test_case_insensitive_scan(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        assert matcher.scan("LAST HOPE") == matcher.scan("last hope") != 0
+    
+    def test_repeated_phrase_counted_once(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        hits = matcher.scan("last hope, last hope, last hope")
+        assert matcher.count(hits) == 1
+    
+    def test_overlapping_phrases_all_match(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        hits = matcher.scan("I feel completely alone in this")
+        
+        assert matcher.matched_phrases(hits) == {"completely alone", "completely alone in this"}
+        assert matcher.categories(hits) == {"crisis_language", "isolation_indicators"}
+    
+    def test_phrase_ids_ascending(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        hits = matcher.scan("I feel completely alone in this")
+        
+        ids = matcher.phrase_ids(hits)
+        assert ids == sorted(ids)
+        assert {matcher.phrases[i] for i in ids} == matcher.matched_phrases(hits)
+        assert matcher.phrase_ids(0) == []
+    
+    def test_category_mask_follows_category_order(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        
+        assert matcher.category_mask(0) == 0
+        assert matcher.category_mask(matcher.scan("lost my job")) == 0b010
+        assert matcher.category_mask(matcher.scan("completely alone in this")) == 0b101
+    
+    def test_categories_reused_for_same_mask(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        first = matcher.categories(matcher.scan("lost my job"))
+        second = matcher.categories(matcher.scan("my last $100"))
+        
+        assert first == {"financial_desperation"}
+        assert first is second
+    
+    def test_duplicate_phrase_across_categories(self):
+        matcher = IndicatorMatcher({"a": ["Same Phrase"], "b": ["same phrase"]})
+        hits = matcher.scan("the same phrase")
+        
+        assert len(matcher.phrases) == 1
+        assert matcher.count(hits) == 1
+        assert matcher.categories(hits) == {"a", "b"}
+    
+    def test_repeated_scan_served_from_cache(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        text = CountingStr("I lost my job")
+        
+        assert matcher.scan(text) == matcher.scan(text)
+        assert text.lower_calls == 1
+    
+    def test_long_input_bypasses_cache(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        text = CountingStr("x" * (IndicatorMatcher.SCAN_CACHE_MAX_LENGTH + 1) + " last hope")
+        
+        assert matcher.count(matcher.scan(text)) == 1
+        assert matcher.count(matcher.scan(text)) == 1
+        assert text.lower_calls == 2
+    
+    def test_clear_cache_rescans(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        text = CountingStr("I lost my job")
+        
+        matcher.scan(text)
+        matcher.clear_cache()
+        matcher.scan(text)
+        assert text.lower_calls == 2
+    
+    def test_matcher_freed_without_cycle_collection(self):
+        gc.disable()
+        try:
+            matcher = IndicatorMatcher(INDICATORS)
+            matcher.scan("I lost my job")
+            ref = weakref.ref(matcher)
+            del matcher
+            assert ref() is None
+        finally:
+            gc.enable()
+    
+    def test_min_phrase_length(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        assert matcher.min_phrase_length == len("last $100")
+        assert matcher.scan("") == 0
+        assert matcher.scan("lost") == 0
+        assert matcher.count(matcher.scan("LAST $100")) == 1
+    
+    def test_empty_indicators(self):
+        matcher = IndicatorMatcher({})
+        assert matcher.scan("anything at all") == 0
+    
+    def test_empty_phrases_ignored_by_both_backends(self):
+        indicators = {"a": ["hope,", "", "x"]}
+        default = IndicatorMatcher(indicators)
+        substring = IndicatorMatcher(indicators, use_automaton=False)
+        
+        assert "" not in substring.phrases
+        assert substring.scan("zzz") == default.scan("zzz") == 0
+        assert substring.scan_many(["zzz", "x"]) == default.scan_many(["zzz", "x"])
+        assert substring.count(substring.scan("x")) == 1
+    
+    def test_substring_backend_forced(self):
+        matcher = IndicatorMatcher(INDICATORS, use_automaton=False)
+        assert matcher.backend == "substring"
+        assert matcher.count(matcher.scan("lost my job, last hope")) == 2
+    
+    def test_scan_many_matches_scan(self):
+        matcher = IndicatorMatcher(INDICATORS)
+        texts = ["lost my", " job", "", "I lost my job", "LAST HOPE", "completely alone in this"]
+        
+        assert matcher.scan_many(texts) == [matcher.scan(text) for text in texts]
+        assert matcher.scan_many([]) == []
+    
+    def test_automaton_scan_many_matches_substring(self):
+        pytest.importorskip("ahocorasick")
+        automaton = IndicatorMatcher(INDICATORS)
+        substring = IndicatorMatcher(INDICATORS, use_automaton=False)
+        # Phrases split across neighbouring texts must not match
+        texts = ["i lost my", "job", "last hope", "", "no one to talk to, last $100"]
+        
+        assert automaton.scan_many(texts) == substring.scan_many(texts)
+    
+    def test_automaton_backend_matches_substring_backend(self):
+        pytest.importorskip("ahocorasick")
+        automaton = IndicatorMatcher(INDICATORS)
+        substring = IndicatorMatcher(INDICATORS, use_automaton=False)
+        
+        assert automaton.backend == "automaton"
+        for text in [
+            "Hello there",
+            "I feel completely alone in this",
+            "LOST MY JOB, my last $100, last hope, last hope",
+        ]:
+            assert automaton.scan(text) == substring.scan(text)
@@ -2,6 +2,11 @@
 Tests for LFAS data models
 """
 
+import dataclasses
+import sys
+
+import pytest
+
 from lfas.models import (
     ProtectionLevel, CrisisType, DetectionResult, 
     CrisisResult, CrisisResource
@@ -20,17 +25,38 @@ class TestProtectionLevel:
         assert ProtectionLevel.STANDARD.name == "STANDARD"
         assert ProtectionLevel.ENHANCED.name == "ENHANCED"
         assert ProtectionLevel.CRISIS.name == "CRISIS"
+    
+    def test_levels_are_ordered_integers(self):
+        assert ProtectionLevel.STANDARD < ProtectionLevel.ENHANCED < ProtectionLevel.CRISIS
+        assert ProtectionLevel.CRISIS == 3
+        assert ProtectionLevel(2) is ProtectionLevel.ENHANCED
+    
+    def test_levels_print_by_name(self):
+        assert str(ProtectionLevel.CRISIS) == "ProtectionLevel.CRISIS"
+        assert f"{ProtectionLevel.ENHANCED}" == "ProtectionLevel.ENHANCED"
+        assert f"{ProtectionLevel.STANDARD.value}" == "1"
 
 
 class TestCrisisType:
     """Test CrisisType enum"""
     
+    def test_types_print_by_name(self):
+        assert str(CrisisType.MENTAL_HEALTH) == "CrisisType.MENTAL_HEALTH"
+        assert f"{CrisisType.MIXED}" == "CrisisType.MIXED"
+        assert f"{CrisisType.FINANCIAL.value}" == "financial"
+        assert CrisisType.HEALTH == "health"
+    
     def test_crisis_types_exist(self):
         assert CrisisType.MENTAL_HEALTH.value == "mental_health"
         assert CrisisType.FINANCIAL.value == "financial"
         assert CrisisType.HEALTH.value == "health"
         assert CrisisType.ABUSE.value == "abuse"
         assert CrisisType.MIXED.value == "mixed"
+    
+    def test_types_compare_as_strings(self):
+        assert CrisisType.MENTAL_HEALTH == "mental_health"
+        assert CrisisType("financial") is CrisisType.FINANCIAL
+        assert {"abuse": 1}[CrisisType.ABUSE] == 1
 
 
 class TestDetectionResult:
@@ -46,7 +72,7 @@ class TestDetectionResult:
         
         assert result.protection_level == ProtectionLevel.ENHANCED
         assert result.triggers_count == 2
-        assert result.detected_categories == ["crisis_language"]
+        assert result.detected_categories == frozenset(["crisis_language"])
         assert result.original_input == "test input"
         assert result.conversation_history is None
     
@@ -60,7 +86,7 @@ class TestDetectionResult:
             conversation_history=history
         )
         
-        assert result.conversation_history == history
+        assert result.conversation_history == tuple(history)
     
     def test_string_representation(self):
         result = DetectionResult(
@@ -73,6 +99,56 @@ class TestDetectionResult:
         str_repr = str(result)
         assert "STANDARD" in str_repr
         assert "triggers=0" in str_repr
+    
+    def test_categories_stored_as_frozenset(self):
+        result = DetectionResult(
+            protection_level=ProtectionLevel.ENHANCED,
+            triggers_count=2,
+            detected_categories=["crisis_language", "health_crisis", "crisis_language"],
+            original_input="test input"
+        )
+        
+        assert isinstance(result.detected_categories, frozenset)
+        assert result.detected_categories == {"crisis_language", "health_crisis"}
+        assert "categories=['crisis_language', 'health_crisis']" in str(result)
+    
+    def test_repr_is_summary(self):
+        result = DetectionResult(
+            protection_level=ProtectionLevel.CRISIS,
+            triggers_count=3,
+            detected_categories=["crisis_language"],
+            original_input="a very long message",
+            conversation_history=["earlier message"]
+        )
+        
+        repr_str = repr(result)
+        assert "DetectionResult" in repr_str
+        assert "triggers=3" in repr_str
+        assert "categories=" in repr_str
+        assert "a very long message" not in repr_str
+        assert "earlier message" not in repr_str
+    
+    def test_is_immutable(self):
+        result = DetectionResult(
+            protection_level=ProtectionLevel.STANDARD,
+            triggers_count=0,
+            detected_categories=[],
+            original_input="test"
+        )
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.triggers_count = 5
+    
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    def test_uses_slots(self):
+        result = DetectionResult(
+            protection_level=ProtectionLevel.STANDARD,
+            triggers_count=0,
+            detected_categories=[],
+            original_input="test"
+        )
+        
+        assert not hasattr(result, "__dict__")
 
 
 class TestCrisisResource:
@@ -99,6 +175,13 @@ class TestCrisisResource:
         )
         
         assert resource.available_247 is False
+    
+    def test_is_immutable_and_hashable(self):
+        resource = CrisisResource(name="Line", contact="111", description="Desc")
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            resource.name = "Other"
+        assert resource in {CrisisResource(name="Line", contact="111", description="Desc")}
 
 
 class TestCrisisResult:
@@ -154,6 +237,48 @@ class TestCrisisResult:
         assert "Action 2" in message
         assert "not alone" in message
     
+    def test_format_crisis_message_layout(self):
+        result = CrisisResult(
+            crisis_type=CrisisType.MENTAL_HEALTH,
+            protection_level=ProtectionLevel.CRISIS,
+            detected_indicators=[],
+            primary_resources=[
+                CrisisResource(name="Line A", contact="111", description="First"),
+                CrisisResource(name="Line B", contact="222", description="Second")
+            ],
+            recommended_actions=["Action 1"],
+            user_message="You need help"
+        )
+        
+        assert result.format_crisis_message() == "\n".join([
+            "⚠️ CRISIS SUPPORT ACTIVATED",
+            "",
+            "You need help",
+            "",
+            "📞 IMMEDIATE RESOURCES:",
+            "• Line A: 111",
+            "  First",
+            "• Line B: 222",
+            "  Second",
+            "",
+            "🔒 RECOMMENDED ACTIONS:",
+            "• Action 1",
+            "",
+            "Remember: You are not alone. Professional help is available 24/7.",
+        ])
+    
+    def test_format_crisis_message_cached(self):
+        result = CrisisResult(
+            crisis_type=CrisisType.FINANCIAL,
+            protection_level=ProtectionLevel.CRISIS,
+            detected_indicators=[],
+            primary_resources=[],
+            recommended_actions=[],
+            user_message="Message"
+        )
+        
+        assert result.format_crisis_message() is result.format_crisis_message()
+    
     def test_string_representation(self):
         result = CrisisResult(
             crisis_type=CrisisType.FINANCIAL,
@@ -167,3 +292,39 @@ class TestCrisisResult:
         str_repr = str(result)
         assert "financial" in str_repr
         assert "CRISIS" in str_repr
+    
+    def test_repr_is_summary(self):
+        result = CrisisResult(
+            crisis_type=CrisisType.MENTAL_HEALTH,
+            protection_level=ProtectionLevel.CRISIS,
+            detected_indicators=["mental_health: 'suicidal'"],
+            primary_resources=[CrisisResource(name="Line", contact="111", description="Desc")],
+            recommended_actions=["Call 988"],
+            user_message="A long supportive message"
+        )
+        
+        repr_str = repr(result)
+        assert repr_str == "CrisisResult(type=mental_health, level=CRISIS, resources=1)"
+        assert "A long supportive message" not in repr_str
+    
+    def test_sequences_stored_as_tuples(self):
+        result = CrisisResult(
+            crisis_type=CrisisType.FINANCIAL,
+            protection_level=ProtectionLevel.CRISIS,
+            detected_indicators=["financial: 'lost my job'"],
+            primary_resources=[CrisisResource(name="Line", contact="111", description="Desc")],
+            recommended_actions=["Action 1"],
+            user_message="Message"
+        )
+        
+        assert result.detected_indicators == ("financial: 'lost my job'",)
+        assert isinstance(result.primary_resources, tuple)
+        assert result.recommended_actions == ("Action 1",)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.user_message = "Changed"
+        
+        # Formatting caches its output outside the result's fields
+        before = dataclasses.astuple(result)
+        result.format_crisis_message()
+        assert dataclasses.astuple(result) == before
+        assert [f.name for f in dataclasses.fields(result)][-1] == "user_message"
@@ -2,9 +2,26 @@
 Tests for SpecificationLoader
 """
 
+import os
+import shutil
+import sys
 import pytest
 from pathlib import Path
-from lfas.specification_loader import SpecificationLoader
+import xml.etree.ElementTree as ET
+from lfas.specification_loader import SpecificationLoader, DEFAULT_SPEC_PATH, SPEC_CACHE_MAX_FILES
+
+
+def count_parses(monkeypatch):
+    """Record every specification file parsed from now on"""
+    parsed = []
+    real_parse = ET.parse
+    
+    def parse(source):
+        parsed.append(source)
+        return real_parse(source)
+    
+    monkeypatch.setattr(ET, "parse", parse)
+    return parsed
 
 
 class TestSpecificationLoader:
@@ -24,9 +41,18 @@ class TestSpecificationLoader:
         with pytest.raises(FileNotFoundError):
             SpecificationLoader("/nonexistent/path.xml")
     
-    def test_load_vulnerability_indicators(self):
-        loader = SpecificationLoader()
-        indicators = loader.load_vulnerability_indicators()
+    def test_path_through_file_or_symlink_loop_not_found(self, tmp_path):
+        spec_copy = tmp_path / "spec.xml"
+        shutil.copy(DEFAULT_SPEC_PATH, spec_copy)
+        loop = tmp_path / "loop.xml"
+        loop.symlink_to(loop)
+        
+        for path in (spec_copy / "spec.xml", loop):
+            with pytest.raises(FileNotFoundError, match="Specification file not found"):
+                SpecificationLoader(str(path))
+    
+    def test_load_vulnerability_indicators(self, spec_loader):
+        indicators = spec_loader.load_vulnerability_indicators()
         
         # Check that indicators were loaded
         assert isinstance(indicators, dict)
@@ -43,18 +69,24 @@ class TestSpecificationLoader:
             assert isinstance(indicator_list, list)
             assert len(indicator_list) > 0
     
-    def test_indicators_are_strings(self):
-        loader = SpecificationLoader()
-        indicators = loader.load_vulnerability_indicators()
+    def test_indicators_are_strings(self, spec_loader):
+        indicators = spec_loader.load_vulnerability_indicators()
         
         for category, indicator_list in indicators.items():
             for indicator in indicator_list:
                 assert isinstance(indicator, str)
                 assert len(indicator) > 0
     
-    def test_load_protection_escalation_rules(self):
-        loader = SpecificationLoader()
-        rules = loader.load_protection_escalation_rules()
+    def test_indicators_are_interned(self, spec_loader):
+        indicators = spec_loader.load_vulnerability_indicators()
+        
+        for category, indicator_list in indicators.items():
+            assert category is sys.intern(category)
+            for indicator in indicator_list:
+                assert indicator is sys.intern(indicator)
+    
+    def test_load_protection_escalation_rules(self, spec_loader):
+        rules = spec_loader.load_protection_escalation_rules()
         
         assert isinstance(rules, dict)
         assert "standard_max" in rules
@@ -68,18 +100,16 @@ class TestSpecificationLoader:
         assert rules["enhanced_max"] == 2
         assert rules["crisis_min"] == 3
     
-    def test_load_crisis_indicators(self):
-        loader = SpecificationLoader()
-        crisis_indicators = loader.load_crisis_indicators()
+    def test_load_crisis_indicators(self, spec_loader):
+        crisis_indicators = spec_loader.load_crisis_indicators()
         
         # Should have crisis type categories
         assert isinstance(crisis_indicators, dict)
         # May be empty if VR-24 structure is different
         # Just verify it returns a dict
     
-    def test_load_crisis_resources(self):
-        loader = SpecificationLoader()
-        resources = loader.load_crisis_resources()
+    def test_load_crisis_resources(self, spec_loader):
+        resources = spec_loader.load_crisis_resources()
         
         assert isinstance(resources, dict)
         
@@ -100,25 +130,22 @@ class TestSpecificationLoader:
             assert "description" in resource
             assert "available_247" in resource
     
-    def test_988_resource_exists(self):
-        loader = SpecificationLoader()
-        resources = loader.load_crisis_resources()
+    def test_988_resource_exists(self, spec_loader):
+        resources = spec_loader.load_crisis_resources()
         
         mental_health = resources["mental_health"]
         has_988 = any("988" in r["contact"] for r in mental_health)
         assert has_988, "988 Suicide & Crisis Lifeline should be included"
     
-    def test_crisis_text_line_exists(self):
-        loader = SpecificationLoader()
-        resources = loader.load_crisis_resources()
+    def test_crisis_text_line_exists(self, spec_loader):
+        resources = spec_loader.load_crisis_resources()
         
         mental_health = resources["mental_health"]
         has_crisis_text = any("741741" in r["contact"] for r in mental_health)
         assert has_crisis_text, "Crisis Text Line should be included"
     
-    def test_get_metadata(self):
-        loader = SpecificationLoader()
-        metadata = loader.get_metadata()
+    def test_get_metadata(self, spec_loader):
+        metadata = spec_loader.get_metadata()
         
         assert isinstance(metadata, dict)
         assert "version" in metadata
@@ -128,3 +155,68 @@ class TestSpecificationLoader:
         # Check expected values
         assert metadata["version"] == "4.0"
         assert "Mehmet" in metadata["creator"]
+    
+    def test_sections_returned_as_fresh_copies(self):
+        loader = SpecificationLoader()
+        
+        indicators = loader.load_vulnerability_indicators()
+        indicators['crisis_language'].append('purple elephant')
+        indicators['custom'] = ['custom phrase']
+        loader.load_crisis_resources()['mental_health'][0]['contact'] = '000'
+        loader.load_protection_escalation_rules()['crisis_min'] = 2
+        
+        assert 'purple elephant' not in loader.load_vulnerability_indicators()['crisis_language']
+        assert 'custom' not in loader.load_vulnerability_indicators()
+        assert loader.load_crisis_resources()['mental_health'][0]['contact'] == '988 (call or text)'
+        assert loader.load_protection_escalation_rules()['crisis_min'] == 3
+        assert 'custom' not in SpecificationLoader().load_vulnerability_indicators()
+    
+    def test_parsed_tree_shared_between_loaders(self, monkeypatch, tmp_path):
+        spec_copy = tmp_path / "spec.xml"
+        shutil.copy(DEFAULT_SPEC_PATH, spec_copy)
+        parsed = count_parses(monkeypatch)
+        
+        SpecificationLoader(str(spec_copy))
+        SpecificationLoader(str(spec_copy))
+        
+        assert len(parsed) == 1
+    
+    def test_tree_is_loaders_own_copy(self):
+        loader = SpecificationLoader()
+        loader.root.remove(loader.root.find("metadata"))
+        
+        assert loader.root.find("metadata") is None
+        assert loader.tree.getroot() is loader.root
+        assert loader.get_metadata()["version"] == "4.0"
+        assert SpecificationLoader().root.find("metadata") is not None
+    
+    def test_modified_file_is_reparsed(self, monkeypatch, tmp_path):
+        spec_copy = tmp_path / "spec.xml"
+        shutil.copy(DEFAULT_SPEC_PATH, spec_copy)
+        parsed = count_parses(monkeypatch)
+        
+        first = SpecificationLoader(str(spec_copy))
+        stat = spec_copy.stat()
+        os.utime(spec_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = SpecificationLoader(str(spec_copy))
+        
+        assert len(parsed) == 2
+        assert second.load_vulnerability_indicators() == first.load_vulnerability_indicators()
+    
+    def test_parsed_trees_kept_for_limited_files(self, monkeypatch, tmp_path):
+        paths = []
+        for index in range(SPEC_CACHE_MAX_FILES + 1):
+            spec_copy = tmp_path / f"spec{index}.xml"
+            shutil.copy(DEFAULT_SPEC_PATH, spec_copy)
+            paths.append(str(spec_copy))
+        parsed = count_parses(monkeypatch)
+        
+        for path in paths:
+            SpecificationLoader(path)
+        assert len(parsed) == len(paths)
+        
+        # The least recently used file was dropped; recent ones are reused
+        SpecificationLoader(paths[-1])
+        assert len(parsed) == len(paths)
+        SpecificationLoader(paths[0])
+        assert len(parsed) == len(paths) + 1